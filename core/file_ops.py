@@ -4,8 +4,43 @@ Handles saving, opening, recent files, and session management.
 """
 import json
 import os
+import stat
+import tempfile
+import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Tuple
+
+try:
+    import orjson
+except ImportError:
+    # Optional faster JSON backend; stdlib json is used otherwise
+    orjson = None
+
+
+# Seconds a recent file existence check stays valid
+RECENT_FILE_CHECK_TTL = 5.0
+
+# Read once at import: os.umask can only be queried by setting it, which races with threads
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+
+def _temp_beside(file_path) -> Tuple[int, str]:
+    """
+    Create a uniquely named hidden temp file next to file_path and return
+    (fd, path). It never collides with a user's own file or a concurrent save.
+    """
+    directory, name = os.path.split(os.fspath(file_path))
+    return tempfile.mkstemp(dir=directory or None, prefix=f".{name}.", suffix=".tmp")
+
+
+def _mode_for(file_path) -> int:
+    """Permission bits for a file replacing file_path (mkstemp creates files 0600)."""
+    try:
+        return stat.S_IMODE(os.stat(file_path).st_mode)
+    except FileNotFoundError:
+        return 0o666 & ~_UMASK
 
 
 class FileOperations:
@@ -16,13 +51,22 @@ class FileOperations:
             config_path = Path(__file__).parent.parent / "config" / "kun_config.json"
         self.config_path = Path(config_path)
         self.config = self.load_config()
+        # path -> (checked_at, exists) for recent file existence checks
+        self._recent_cache: Dict[str, Tuple[float, bool]] = {}
+        # Config has in-memory changes not yet written to disk
+        self._dirty = False
+        # Nesting depth of batch() blocks; writes are deferred while > 0
+        self._batch_depth = 0
         
     def load_config(self) -> dict:
         """Load configuration from JSON file."""
         try:
             if self.config_path.exists():
-                with open(self.config_path, 'r', encoding='utf-8') as f:
-                    return json.load(f)
+                # Read in one go and parse the bytes directly
+                data = self.config_path.read_bytes()
+                if orjson is not None:
+                    return orjson.loads(data)
+                return json.loads(data.decode('utf-8'))
         except Exception as e:
             print(f"Error loading config: {e}")
         
@@ -31,7 +75,7 @@ class FileOperations:
             "recent_files": [],
             "theme": "noir",
             "auto_save": False,
-            "auto_save_interval": 60,
+            "auto_save_interval": 30,
             "restore_session": True,
             "show_line_numbers": False,
             "spell_check_enabled": True,
@@ -40,11 +84,53 @@ class FileOperations:
         }
     
     def save_config(self):
-        """Persist configuration to disk."""
+        """Persist configuration to disk (deferred while inside batch())."""
+        self._dirty = True
+        if self._batch_depth == 0:
+            self._flush()
+    
+    @contextmanager
+    def batch(self):
+        """Group several config changes into a single disk write."""
+        self._batch_depth += 1
+        try:
+            yield self
+        finally:
+            self._batch_depth -= 1
+            if self._batch_depth == 0:
+                self.flush()
+    
+    def flush(self, durable: bool = False):
+        """Write pending config changes, if any (fsync them when durable)."""
+        if self._dirty:
+            self._flush(durable)
+    
+    def _flush(self, durable: bool = False):
+        """Write configuration to disk atomically."""
         try:
             self.config_path.parent.mkdir(parents=True, exist_ok=True)
-            with open(self.config_path, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2, ensure_ascii=False)
+            if orjson is not None:
+                payload = orjson.dumps(self.config, option=orjson.OPT_INDENT_2)
+            else:
+                payload = json.dumps(self.config, indent=2, ensure_ascii=False).encode('utf-8')
+            # Write a sibling temp file and swap it in, so a crash mid-write
+            # never leaves a truncated config behind
+            fd, tmp_path = _temp_beside(self.config_path)
+            try:
+                with open(fd, 'wb') as f:
+                    f.write(payload)
+                    if durable:
+                        f.flush()
+                        os.fsync(f.fileno())
+                os.chmod(tmp_path, _mode_for(self.config_path))
+                os.replace(tmp_path, self.config_path)
+            except BaseException:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+                raise
+            self._dirty = False
         except Exception as e:
             print(f"Error saving config: {e}")
     
@@ -59,8 +145,9 @@ class FileOperations:
         if file_path in recent:
             recent.remove(file_path)
         
-        # Add to front
+        # Add to front; it exists now regardless of any earlier check
         recent.insert(0, file_path)
+        self._recent_cache.pop(file_path, None)
         
         # Keep only 15 most recent
         self.config["recent_files"] = recent[:15]
@@ -70,12 +157,24 @@ class FileOperations:
         """Get list of recent files (filters out non-existent files)."""
         recent = self.config.get("recent_files", [])
         # Filter out files that no longer exist
-        existing = [f for f in recent if os.path.exists(f)]
+        existing = [f for f in recent if self._recent_file_exists(f)]
         if len(existing) != len(recent):
+            # Persisted with the next config write instead of on every query
             self.config["recent_files"] = existing
-            self.save_config()
+            self._dirty = True
         return existing
     
+    def _recent_file_exists(self, file_path: str) -> bool:
+        """Check file existence, reusing results younger than RECENT_FILE_CHECK_TTL."""
+        now = time.monotonic()
+        cached = self._recent_cache.get(file_path)
+        if cached and now - cached[0] < RECENT_FILE_CHECK_TTL:
+            return cached[1]
+        
+        exists = os.path.exists(file_path)
+        self._recent_cache[file_path] = (now, exists)
+        return exists
+    
     def clear_recent_files(self):
         """Clear all recent files."""
         self.config["recent_files"] = []
@@ -100,6 +199,46 @@ class FileOperations:
             print(f"Error writing file {file_path}: {e}")
             return False
     
+    def write_file_atomic(self, file_path: str, content: str, durable: bool = False) -> bool:
+        """
+        Write content through a uniquely named sibling temp file swapped in
+        with os.replace. A symlink is written through to its target, and the
+        replaced file's mode (and, where allowed, owner) is kept. Only fsyncs
+        when durable; safe to call from a worker thread.
+        """
+        file_path = os.path.realpath(file_path)
+        tmp_path = None
+        try:
+            try:
+                original = os.stat(file_path)
+            except FileNotFoundError:
+                original = None
+            fd, tmp_path = _temp_beside(file_path)
+            with open(fd, 'w', encoding='utf-8') as f:
+                f.write(content)
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+            if original is not None:
+                os.chmod(tmp_path, stat.S_IMODE(original.st_mode))
+                if hasattr(os, 'chown'):
+                    try:
+                        os.chown(tmp_path, original.st_uid, original.st_gid)
+                    except PermissionError:
+                        pass  # Only root may give a file to another user
+            else:
+                os.chmod(tmp_path, 0o666 & ~_UMASK)
+            os.replace(tmp_path, file_path)
+            return True
+        except Exception as e:
+            print(f"Error writing file {file_path}: {e}")
+            if tmp_path is not None:
+                try:
+                    os.remove(tmp_path)
+                except OSError:
+                    pass
+            return False
+    
     def save_session(self, tabs: List[Dict]):
         """Save current session (open tabs) to config."""
         self.config["last_session"] = {"tabs": tabs}
@@ -0,0 +1,45 @@
+"""
+Find engine module for Kun text editor.
+Locates every occurrence of a literal search string in a text.
+"""
+import re
+from functools import lru_cache
+from typing import List, Tuple
+
+
+@lru_cache(maxsize=8)
+def compile_literal(text: str, case_sensitive: bool = True, whole_words: bool = False) -> re.Pattern:
+    """
+    Compile a literal search string, memoized for repeated searches.
+    Whole words follow QTextDocument's rule: no letter or digit on either side.
+    """
+    body = re.escape(text)
+    if whole_words:
+        body = rf'(?<![^\W_]){body}(?![^\W_])'
+    return re.compile(body, 0 if case_sensitive else re.IGNORECASE)
+
+
+def find_literal(text: str, literal: str, case_sensitive: bool = True,
+                 whole_words: bool = False) -> List[Tuple[int, int]]:
+    """
+    Find every non-overlapping occurrence of a literal in text, leftmost first.
+    Returns a list of (start, end) str indices.
+    """
+    if not text or not literal:
+        return []
+    
+    # A folded literal is found faster by str.find on lowered text than by
+    # an IGNORECASE regex; lowering only keeps positions for ASCII, though
+    if not case_sensitive and not whole_words and text.isascii() and literal.isascii():
+        haystack = text.lower()
+        needle = literal.lower()
+        matches = []
+        length = len(needle)
+        find = haystack.find
+        start = find(needle)
+        while start >= 0:
+            matches.append((start, start + length))
+            start = find(needle, start + length)
+        return matches
+    
+    return [match.span() for match in compile_literal(literal, case_sensitive, whole_words).finditer(text)]
@@ -2,66 +2,151 @@
 Spell checking module for Kun text editor.
 Uses pyspellchecker for basic spell checking functionality.
 """
-from spellchecker import SpellChecker
+from functools import lru_cache
+from importlib import metadata
+from pathlib import Path
+import os
+import pickle
 import re
+import threading
+
+
+# Alphabetic tokens only; compiled once for the whole module
+_WORD_RE = re.compile(r'\b[a-zA-Z]+\b')
+
+# Prebuilt word sets are cached next to the user config
+_CACHE_DIR = Path(__file__).parent.parent / "config"
 
 
 class BasicSpellChecker:
     """Provides spell checking functionality."""
     
-    def __init__(self, language: str = 'en'):
-        """Initialize spell checker with specified language."""
+    __slots__ = ('language', 'spell', 'enabled', '_known', '_cached_suggestions',
+                 '_loaded', '_on_ready')
+    
+    def __init__(self, language: str = 'en', on_ready=None):
+        """
+        Initialize spell checker with specified language.
+        The dictionary loads on a background thread; until it is ready every
+        word counts as correct. on_ready is called from that thread when done;
+        the owner then turns checking on with set_enabled() from its own thread,
+        so the two threads never both write enabled.
+        """
+        self.language = language
+        self.spell = None
+        self._known = frozenset()
+        # Candidate generation is the expensive part; reuse it per (word, limit)
+        self._cached_suggestions = lru_cache(maxsize=2048)(self._suggest)
+        self._loaded = False
+        self.enabled = False
+        self._on_ready = on_ready
+        
+        threading.Thread(target=self._load, daemon=True).start()
+    
+    def _load(self):
+        """Load the word set, from the pickle cache when possible (worker thread)."""
         try:
-            self.spell = SpellChecker(language=language)
-            self.enabled = True
+            version = metadata.version("pyspellchecker")
+            cache_path = _CACHE_DIR / f"spell_{self.language}.pkl"
+            known = self._read_cache(cache_path, version)
+            if known is None:
+                # Cache miss: build the full checker once and store its words
+                self.spell = self._build_spell()
+                known = frozenset(self.spell.word_frequency.dictionary)
+                self._write_cache(cache_path, version, known)
+            loaded = True
         except Exception as e:
             print(f"Error initializing spell checker: {e}")
-            self.spell = None
-            self.enabled = False
+            known = frozenset()
+            loaded = False
+        
+        # Plain frozenset membership: an lru_cache in front of it is slower
+        self._known = known
+        self._loaded = loaded
+        
+        if self._on_ready:
+            self._on_ready()
+    
+    def _build_spell(self):
+        """Construct the pyspellchecker instance (parses its bundled dictionary)."""
+        from spellchecker import SpellChecker
+        return SpellChecker(language=self.language)
+    
+    @staticmethod
+    def _read_cache(cache_path: Path, version: str):
+        """Return the cached word set, or None if missing or from another version."""
+        try:
+            if cache_path.exists():
+                cached_version, known = pickle.loads(cache_path.read_bytes())
+                if cached_version == version:
+                    return known
+        except Exception as e:
+            print(f"Error reading spell cache {cache_path}: {e}")
+        return None
+    
+    @staticmethod
+    def _write_cache(cache_path: Path, version: str, known: frozenset):
+        """Store the word set for the next start."""
+        try:
+            cache_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = cache_path.with_suffix('.pkl.tmp')
+            tmp_path.write_bytes(pickle.dumps((version, known), protocol=pickle.HIGHEST_PROTOCOL))
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            print(f"Error writing spell cache {cache_path}: {e}")
     
     def check_word(self, word: str) -> bool:
         """Check if a single word is spelled correctly."""
-        if not self.enabled or not self.spell or not word:
+        if not self.enabled or not word:
             return True
         
         # Skip words with numbers or special characters
         if not word.isalpha():
             return True
         
-        # Use the known() method to check if word is in dictionary
-        word_lower = word.lower()
-        return len(self.spell.known([word_lower])) > 0
+        # Direct dictionary lookup instead of known(), which builds a set per call
+        return word.lower() in self._known
     
     def get_suggestions(self, word: str, max_suggestions: int = 5) -> list:
         """Get spelling suggestions for a misspelled word."""
-        if not self.enabled or not self.spell or not word:
+        if not self.enabled or not word:
             return []
         
-        candidates = self.spell.candidates(word)
+        return list(self._cached_suggestions(word.lower(), max_suggestions))
+    
+    def _suggest(self, word_lower: str, max_suggestions: int) -> tuple:
+        """Compute suggestions for a lowercased word (memoized per instance)."""
+        # Full checker is only built when suggestions are first needed
+        if self.spell is None:
+            try:
+                self.spell = self._build_spell()
+            except Exception as e:
+                print(f"Error initializing spell checker: {e}")
+                return ()
+        
+        candidates = self.spell.candidates(word_lower)
         if candidates:
-            return list(candidates)[:max_suggestions]
-        return []
+            return tuple(candidates)[:max_suggestions]
+        return ()
     
     def find_misspelled_words(self, text: str) -> list:
         """
         Find all misspelled words in text.
         Returns list of tuples: (word, start_position, end_position)
         """
-        if not self.enabled or not self.spell or not text:
+        if not self.enabled or not text:
             return []
         
-        misspelled = []
-        # Find all words with their positions
-        for match in re.finditer(r'\b[a-zA-Z]+\b', text):
-            word = match.group()
-            if not self.check_word(word):
-                misspelled.append((word, match.start(), match.end()))
-        
-        return misspelled
+        is_known = self._known.__contains__
+        # Find all words with their positions in a single pass
+        return [(m.group(), m.start(), m.end())
+                for m in _WORD_RE.finditer(text)
+                if not is_known(m.group().lower())]
     
     def set_enabled(self, enabled: bool):
         """Enable or disable spell checking."""
-        self.enabled = enabled and self.spell is not None
+        self.enabled = enabled and self._loaded
+        self._cached_suggestions.cache_clear()
     
     def is_enabled(self) -> bool:
         """Check if spell checking is enabled."""
@@ -8,6 +8,9 @@ import re
 class TextAnalyzer:
     """Analyzes text content for statistics."""
     
+    # Stateless: only static methods, so instances need no __dict__
+    __slots__ = ()
+    
     @staticmethod
     def count_words(text: str) -> int:
         """Count words in text."""
@@ -40,12 +43,11 @@ class TextAnalyzer:
         # Limit cursor position to text length
         cursor_position = min(cursor_position, len(text))
         
-        # Count lines up to cursor
-        text_before = text[:cursor_position]
-        line_number = text_before.count('\n') + 1
+        # Count lines up to cursor (bounded search, no prefix copy)
+        line_number = text.count('\n', 0, cursor_position) + 1
         
         # Find column (position in current line)
-        last_newline = text_before.rfind('\n')
+        last_newline = text.rfind('\n', 0, cursor_position)
         if last_newline == -1:
             column_number = cursor_position + 1
         else:
@@ -60,11 +62,24 @@ class TextAnalyzer:
             return 1
         return text.count('\n') + 1
     
+    @staticmethod
+    def count_line(text: str) -> tuple:
+        """
+        Tally a single line for incremental statistics.
+        Returns (words, non_space_characters, characters).
+        """
+        # One split gives both the word count and the non-space character count
+        words = text.split()
+        return (len(words), sum(map(len, words)), len(text))
+    
     @staticmethod
     def get_statistics(text: str, cursor_position: int = 0, with_spaces: bool = True) -> dict:
         """
         Get all text statistics at once.
         Returns dictionary with words, chars, lines, line, col.
+        The editor keeps its word and character counts incrementally from
+        count_line(); this full recount stays as the reference those running
+        totals are tested against, and for callers holding just a string.
         """
         words = TextAnalyzer.count_words(text)
         chars = TextAnalyzer.count_characters(text, with_spaces)
@@ -0,0 +1,34 @@
+"""Shared setup for the tests: an offscreen Qt application and a throwaway main window."""
+
+import os
+import tempfile
+from unittest import mock
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+from PyQt6.QtWidgets import QApplication
+
+from core.file_ops import FileOperations
+
+
+_app = None
+
+
+def application() -> QApplication:
+    """Get the running QApplication, creating an offscreen one the first time."""
+    global _app
+    if QApplication.instance() is None:
+        # Kept referenced: Qt aborts once the application object is collected
+        _app = QApplication([])
+    return QApplication.instance()
+
+
+def make_window():
+    """Create a MainWindow whose settings and session live in a temporary directory."""
+    application()
+    from ui.main_window import MainWindow
+    
+    config_dir = tempfile.mkdtemp(prefix='kun-test-')
+    config_path = os.path.join(config_dir, 'kun_config.json')
+    with mock.patch('ui.main_window.FileOperations', lambda: FileOperations(config_path)):
+        return MainWindow()
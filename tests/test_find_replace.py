@@ -0,0 +1,232 @@
+"""Find and replace in the main window, checked against QTextDocument.find."""
+
+import unittest
+from unittest import mock
+
+from tests.support import make_window
+
+from PyQt6.QtCore import QCoreApplication, QThread
+from PyQt6.QtGui import QTextCursor, QTextDocument
+
+from ui.find_replace_dialog import FindReplaceDialog
+from ui.main_window import _can_overlap, _count_replace
+
+
+def qt_matches(editor, query: str, case_sensitive: bool = False, whole_words: bool = False) -> list:
+    """Every match QTextDocument.find steps through from the start, as (start, end) pairs."""
+    document = editor.document()
+    options = QTextDocument.FindFlag(0)
+    if case_sensitive:
+        options |= QTextDocument.FindFlag.FindCaseSensitively
+    if whole_words:
+        options |= QTextDocument.FindFlag.FindWholeWords
+
+    matches = []
+    cursor = QTextCursor(document)
+    while True:
+        cursor = document.find(query, cursor, options)
+        if cursor.isNull():
+            return matches
+        matches.append((cursor.selectionStart(), cursor.selectionEnd()))
+
+
+class FindReplaceTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.window = make_window()
+
+    @classmethod
+    def tearDownClass(cls):
+        # Stop the background find thread as closeEvent would
+        if cls.window._find_thread is not None:
+            cls.window._find_thread.quit()
+            cls.window._find_thread.wait()
+
+    def setUp(self):
+        self.editor = self.window.new_tab()
+        self.dialog = FindReplaceDialog(self.window)
+
+    def tearDown(self):
+        self.dialog.deleteLater()
+        self.editor.mark_saved()
+
+    def search(self, text: str, query: str, replacement: str = "",
+               case_sensitive: bool = False, whole_words: bool = False):
+        """Load text into the editor and fill in the dialog."""
+        self.editor.set_content(text)
+        self.editor.moveCursor(QTextCursor.MoveOperation.Start)
+        self.dialog.find_input.setText(query)
+        self.dialog.replace_input.setText(replacement)
+        self.dialog.case_sensitive.setChecked(case_sensitive)
+        self.dialog.whole_words.setChecked(whole_words)
+
+    def selection(self) -> tuple:
+        cursor = self.editor.textCursor()
+        return (cursor.selectionStart(), cursor.selectionEnd())
+
+    def highlighted(self) -> list:
+        return [(s.cursor.selectionStart(), s.cursor.selectionEnd()) for s in self.editor.extraSelections()]
+
+    def step(self, count: int, backward: bool = False) -> list:
+        """Press Find Next (or Previous) count times, collecting the selections."""
+        find = self.window.dialog_find_prev if backward else self.window.dialog_find_next
+        selections = []
+        for _ in range(count):
+            find(self.dialog, self.editor)
+            selections.append(self.selection())
+        return selections
+
+    def assert_cache_fresh(self):
+        """The cached matches must equal a full rescan of the current text."""
+        self.assertTrue(self.window._matches_current(self.dialog, self.editor))
+        rescan = self.window._collect_matches(self.editor.get_content(), self.dialog.find_input.text(),
+                                              self.dialog.case_sensitive.isChecked(),
+                                              self.dialog.whole_words.isChecked())
+        self.assertEqual(self.window._find_state['positions'], rescan)
+
+    def test_astral_characters_shift_positions(self):
+        text = "\U0001F600ab \U0001D49Cab\n\U0001F600\U0001F600 AB x\U0001F600ab"
+        for query in ("ab", "\U0001F600a", "\U0001D49C"):
+            with self.subTest(query=query):
+                self.search(text, query)
+                expected = qt_matches(self.editor, query)
+                self.assertTrue(expected)
+                self.assertEqual(self.window._collect_matches(text, query, False), expected)
+                self.assertEqual(self.step(len(expected)), expected)
+                self.assertEqual(self.editor.textCursor().selectedText().casefold(), query)
+
+    def test_whole_word_boundaries(self):
+        text = "ab abc xab ab_ab ab1 ab-ab éab abé AB (ab)\nab"
+        for case_sensitive in (False, True):
+            with self.subTest(case_sensitive=case_sensitive):
+                self.search(text, "ab", case_sensitive=case_sensitive, whole_words=True)
+                expected = qt_matches(self.editor, "ab", case_sensitive, whole_words=True)
+                self.assertEqual(self.window._collect_matches(text, "ab", case_sensitive, True), expected)
+                self.assertEqual(self.step(len(expected)), expected)
+                # Each match is accepted for Replace, and nothing else is
+                for start, end in expected:
+                    self.assertTrue(self.window._is_match(self.dialog, self.editor, start, end))
+                self.assertFalse(self.window._is_match(self.dialog, self.editor, 3, 5))
+
+    def test_overlapping_patterns_step_like_qt(self):
+        self.assertTrue(_can_overlap("aa"))
+        self.assertTrue(_can_overlap("abca"))
+        self.assertFalse(_can_overlap("ab"))
+
+        text = "aaaaa aba ababa\nAbAbA"
+        for query in ("aa", "aba"):
+            with self.subTest(query=query):
+                self.search(text, query)
+                expected = qt_matches(self.editor, query)
+                self.assertEqual(self.step(len(expected) + 1), expected + expected[:1])
+
+                self.editor.moveCursor(QTextCursor.MoveOperation.End)
+                backward = self.step(len(expected), backward=True)
+                self.assertEqual(len(backward), len(expected))
+                for start, end in backward:
+                    self.assertEqual(self.editor.get_content()[start:end].casefold(), query)
+
+    def test_overlapping_patterns_replace_left_to_right(self):
+        for text, query in (("aaaaa", "aa"), ("ababa aba", "aba"), ("AaAa aa", "aa")):
+            with self.subTest(text=text, query=query):
+                self.search(text, query, replacement="-", case_sensitive=True)
+                self.window.dialog_replace_all(self.dialog, self.editor)
+                self.assertEqual(self.editor.get_content(), text.replace(query, "-"))
+                self.assertEqual(_count_replace(text, query, "-", True, False),
+                                 (text.replace(query, "-"), text.count(query)))
+
+    def test_replace_overlapping_match_missing_from_cache(self):
+        self.search("xaaaa", "aa", replacement="-")
+        # Cached as the non-overlapping (1, 3), (3, 5); stepping can select (2, 4)
+        self.assertEqual(self.window._ensure_matches(self.dialog, self.editor), [(1, 3), (3, 5)])
+        self.window.select_match(self.editor, 2, 4)
+        self.assertTrue(self.window._is_match(self.dialog, self.editor, 2, 4))
+        self.window.dialog_replace(self.dialog, self.editor)
+        self.assertEqual(self.editor.get_content(), "xa-a")
+
+    def test_find_bar_rehighlights_moved_interior_matches(self):
+        self.editor.set_content("foo a foo b foo")
+        self.window.show_find_dialog()
+        self.window.find_input.setText("foo")
+        self.window.perform_find()
+        # Same count, same first and last match; only the middle one moves
+        self.editor.set_content("foo foo ab  foo")
+        self.window.perform_find()
+        self.assertEqual(self.highlighted(), [(0, 3), (4, 7), (12, 15)])
+        # New text whose matches land exactly where the old ones were
+        self.editor.set_content("foo foo ba  foo")
+        self.window.perform_find()
+        self.assertEqual(self.highlighted(), [(0, 3), (4, 7), (12, 15)])
+
+    def test_repeated_steps_share_one_background_scan(self):
+        self.search("foo bar\n" * 50, "bar")
+        with mock.patch('ui.main_window.ASYNC_FIND_SIZE', 0):
+            self.step(1)
+            generation = self.window._find_worker.generation
+            # Pressed again before the scan answers: no second scan is sent
+            self.assertEqual(self.step(3), [(12, 15), (20, 23), (28, 31)])
+            self.assertEqual(self.window._find_worker.generation, generation)
+            for _ in range(200):
+                if self.window._matches_current(self.dialog, self.editor):
+                    break
+                QThread.msleep(5)
+                QCoreApplication.processEvents()
+        self.assert_cache_fresh()
+
+    def test_replace_then_find_again(self):
+        text = "foo \U0001F600 foo\nfoofoo bar foo\n\U0001F600foo\nfoo"
+        self.search(text, "foo", replacement="\U0001F600foobar")
+        self.window.dialog_find_next(self.dialog, self.editor)
+
+        for _ in range(4):
+            selected = self.selection()
+            self.window.dialog_replace(self.dialog, self.editor)
+            # The cache was patched rather than dropped, and agrees with a rescan
+            self.assert_cache_fresh()
+            # The next match after the replacement is selected
+            positions = self.window._find_state['positions']
+            replaced_end = selected[0] + len("\U0001F600foobar") + 1
+            following = [match for match in positions if match[0] >= replaced_end]
+            self.assertEqual(self.selection(), following[0])
+            self.assertEqual(self.editor.textCursor().selectedText(), "foo")
+
+        self.assertEqual(self.editor.get_content().count("\U0001F600foobar"), 4)
+
+    def test_replace_skips_a_selection_that_is_not_a_match(self):
+        self.search("foobar foo", "foo", replacement="x", whole_words=True)
+        self.window.select_match(self.editor, 0, 3)
+        self.window.dialog_replace(self.dialog, self.editor)
+        self.assertEqual(self.editor.get_content(), "foobar foo")
+        self.assertEqual(self.selection(), (7, 10))
+
+    def test_replace_all_in_place_matches_bulk(self):
+        cases = (
+            ("Cat cat CAT cat_cat concat \U0001F600cat\ncat", "cat", "dog", False, False),
+            ("Cat cat CAT cat_cat concat \U0001F600cat\ncat", "cat", "dog", False, True),
+            ("Cat cat CAT cat_cat concat \U0001F600cat\ncat", "cat", "", True, True),
+            ("x\U0001F600x \U0001F600\U0001F600", "\U0001F600", "ab", True, False),
+        )
+        for text, query, replacement, case_sensitive, whole_words in cases:
+            with self.subTest(text=text, query=query, whole_words=whole_words):
+                self.search(text, query, replacement, case_sensitive, whole_words)
+                expected_count = len(qt_matches(self.editor, query, case_sensitive, whole_words))
+                self.window.dialog_replace_all(self.dialog, self.editor)
+                in_place = self.editor.get_content()
+
+                self.search(text, query, replacement, case_sensitive, whole_words)
+                with mock.patch('ui.main_window.REPLACE_IN_PLACE_LIMIT', 0):
+                    self.window.dialog_replace_all(self.dialog, self.editor)
+                self.assertEqual(self.editor.get_content(), in_place)
+
+                expected, count = _count_replace(text, query, replacement, case_sensitive, whole_words)
+                self.assertEqual(in_place, expected)
+                self.assertEqual(count, expected_count)
+
+                # Either way it is a single undo step
+                self.editor.undo()
+                self.assertEqual(self.editor.get_content(), text)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+"""Saving and replacing while a large file is still streaming into its tab."""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from tests.support import make_window
+
+from ui.find_replace_dialog import FindReplaceDialog
+
+
+class StreamedLoadTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.window = make_window()
+
+    def setUp(self):
+        self.path = os.path.join(tempfile.mkdtemp(prefix='kun-test-'), 'big.txt')
+        self.text = ''.join(f"line {i} foo\n" for i in range(2000))
+        with open(self.path, 'w', encoding='utf-8') as f:
+            f.write(self.text)
+
+    def open_streamed(self, between_chunks):
+        """Open the file in small pieces, calling between_chunks(editor) after each one."""
+        def process_events():
+            between_chunks(self.window.get_current_editor())
+
+        with mock.patch('ui.main_window.LARGE_FILE_SIZE', 0), \
+                mock.patch('ui.editor_tab.STREAM_CHUNK_SIZE', 1024), \
+                mock.patch('ui.editor_tab.QCoreApplication') as core:
+            core.processEvents.side_effect = process_events
+            self.window.open_file_path(self.path)
+        self.window._autosave_pool.waitForDone()
+        self.assertEqual(core.processEvents.call_count, -(-len(self.text) // 1024))
+        return self.window.get_current_editor()
+
+    def read(self) -> str:
+        with open(self.path, encoding='utf-8') as f:
+            return f.read()
+
+    def assert_whole_file(self, text: str):
+        """Compared without assertEqual's diff, which crawls on texts this long."""
+        self.assertEqual(len(text), len(self.text))
+        self.assertTrue(text == self.text, "text differs from the file")
+
+    def test_save_mid_stream_leaves_the_file_alone(self):
+        def save(editor):
+            self.assertTrue(editor.loading)
+            editor.is_modified = True  # Make it an autosave candidate too
+            self.window.save_file()
+            self.window.auto_save_all()
+            self.window._autosave_pool.waitForDone()
+            self.assert_whole_file(self.read())
+
+        editor = self.open_streamed(save)
+        self.assert_whole_file(editor.get_content())
+        self.assertFalse(editor.is_modified)
+
+        # Once loaded, saving works as usual
+        editor.set_content(self.text + "end\n")
+        self.window.save_file()
+        self.assertTrue(self.read().endswith("line 1999 foo\nend\n"))
+
+    def test_replace_mid_stream_is_refused(self):
+        dialog = FindReplaceDialog(self.window)
+        dialog.find_input.setText("foo")
+        dialog.replace_input.setText("bar")
+
+        def replace(editor):
+            self.window.select_match(editor, 7, 10)
+            self.window.dialog_replace(dialog, editor)
+            self.window.dialog_replace_all(dialog, editor)
+
+        editor = self.open_streamed(replace)
+        self.assert_whole_file(editor.get_content())
+        dialog.deleteLater()
+
+
+if __name__ == '__main__':
+    unittest.main()
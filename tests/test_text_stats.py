@@ -0,0 +1,104 @@
+"""The editor's running word and character counts, checked against a full recount."""
+
+import random
+import unittest
+
+from tests.support import application
+
+from PyQt6.QtGui import QTextCursor
+
+from core.text_analyzer import TextAnalyzer
+from ui.editor_tab import EditorTab
+
+# Words, several kinds of whitespace, accented and astral characters
+_ALPHABET = "ab ab  cd\tÉé\xa0\U0001F600\n\n"
+
+
+class IncrementalStatsTest(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        application()
+
+    def setUp(self):
+        self.editor = EditorTab()
+        self.random = random.Random(20240517)
+
+    def tearDown(self):
+        self.editor.deleteLater()
+
+    def assert_stats_match_recount(self):
+        text = self.editor.toPlainText()
+        stats = TextAnalyzer.get_statistics(text)
+        expected = (stats['words'], stats['characters'],
+                    TextAnalyzer.get_statistics(text, with_spaces=False)['characters'])
+        self.assertEqual(self.editor.get_text_stats(), expected, repr(text))
+
+    def random_text(self, max_length: int = 40) -> str:
+        return ''.join(self.random.choice(_ALPHABET) for _ in range(self.random.randint(0, max_length)))
+
+    def random_cursor(self) -> QTextCursor:
+        """A cursor selecting a random range, which may span several blocks."""
+        last = self.editor.document().characterCount() - 1
+        cursor = QTextCursor(self.editor.document())
+        cursor.setPosition(self.random.randint(0, last))
+        cursor.setPosition(self.random.randint(0, last), QTextCursor.MoveMode.KeepAnchor)
+        return cursor
+
+    def random_edit(self):
+        action = self.random.choice(('paste', 'paste', 'delete', 'grouped', 'undo', 'redo'))
+        if action == 'paste':
+            # Replaces the selection, if any, with text of zero or more lines
+            self.random_cursor().insertText(self.random_text())
+        elif action == 'delete':
+            self.random_cursor().removeSelectedText()
+        elif action == 'grouped':
+            # Several edits that undo as one step
+            cursor = self.random_cursor()
+            cursor.beginEditBlock()
+            cursor.insertText(self.random_text(10))
+            cursor.setPosition(self.random.randint(0, self.editor.document().characterCount() - 1))
+            cursor.insertText(self.random_text(10))
+            cursor.endEditBlock()
+        elif action == 'undo':
+            self.editor.undo()
+        else:
+            self.editor.redo()
+
+    def test_random_edits(self):
+        self.editor.set_content(self.random_text(200))
+        self.assert_stats_match_recount()
+        for _ in range(500):
+            self.random_edit()
+            self.assert_stats_match_recount()
+
+    def test_undo_everything(self):
+        self.editor.set_content("one two\nthree\n\n\U0001F600 four")
+        for _ in range(100):
+            self.random_edit()
+        while self.editor.document().isUndoAvailable():
+            self.editor.undo()
+            self.assert_stats_match_recount()
+        self.assertEqual(self.editor.toPlainText(), "one two\nthree\n\n\U0001F600 four")
+
+    def test_large_paste_and_delete(self):
+        # Over 64 touched blocks the editor copies them through a selection instead
+        self.editor.set_content("start")
+        cursor = QTextCursor(self.editor.document())
+        cursor.movePosition(QTextCursor.MoveOperation.End)
+        cursor.insertText("\n".join(self.random_text(20) for _ in range(300)))
+        self.assert_stats_match_recount()
+
+        cursor.setPosition(3)
+        cursor.setPosition(self.editor.document().characterCount() - 10, QTextCursor.MoveMode.KeepAnchor)
+        cursor.removeSelectedText()
+        self.assert_stats_match_recount()
+
+        self.editor.undo()
+        self.assert_stats_match_recount()
+        self.editor.clear()
+        self.assertEqual(self.editor.get_text_stats(), (0, 0, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -3,9 +3,29 @@ Editor tab component for Kun text editor.
 Provides text editing widget with line numbers and spell checking.
 """
 from PyQt6.QtWidgets import QWidget, QPlainTextEdit, QVBoxLayout, QHBoxLayout
-from PyQt6.QtCore import Qt, pyqtSignal, QRect, QSize
-from PyQt6.QtGui import QTextCursor, QTextFormat, QColor, QPainter, QTextCharFormat, QFont
+from PyQt6.QtCore import (Qt, pyqtSignal, QRect, QSize, QTimer, QRunnable, QThreadPool,
+                          QCoreApplication)
+from PyQt6.QtGui import (QTextCursor, QTextFormat, QColor, QPainter, QTextCharFormat, QFont,
+                         QSyntaxHighlighter, QStaticText)
+from collections import deque
 from typing import Optional
+import os
+
+from core.text_analyzer import TextAnalyzer
+
+
+# Characters inserted per step when streaming a large file into the editor
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# Drop the cached line number labels past this many (a few screens' worth)
+MAX_STATIC_TEXTS = 1024
+
+# Paragraphs repainted per idle step once their spell check results arrive
+SPELL_REPAINT_STEP = 200
+
+# Characters of uncached paragraphs spell checked inline per event loop pass
+# (about a millisecond); the rest, and longer paragraphs, go to the thread pool
+INLINE_SPELL_CHECK_BUDGET = 6000
 
 
 class LineNumberArea(QWidget):
@@ -22,14 +42,111 @@ class LineNumberArea(QWidget):
         self.editor.line_number_area_paint_event(event)
 
 
+class SpellCheckTask(QRunnable):
+    """Checks a batch of paragraphs on a pool thread and reports back by signal."""
+    
+    def __init__(self, spell_checker, blocks: dict, generation: int, ready_signal):
+        super().__init__()
+        self.spell_checker = spell_checker
+        self.blocks = blocks
+        self.generation = generation
+        self.ready_signal = ready_signal
+    
+    def run(self):
+        # A checker that is off or still loading finds nothing; that is no answer
+        if not self.spell_checker.is_enabled():
+            return
+        find = self.spell_checker.find_misspelled_words
+        results = {text: tuple((start, end) for word, start, end in find(text))
+                   for text in self.blocks}
+        if not self.spell_checker.is_enabled():
+            return
+        try:
+            # Cross-thread emit: delivered queued on the GUI thread
+            self.ready_signal.emit(results, self.blocks, self.generation)
+        except RuntimeError:
+            pass  # Editor was closed while the batch ran
+
+
+class SpellHighlighter(QSyntaxHighlighter):
+    """
+    Underlines misspelled words; Qt re-runs it only for blocks that changed.
+    Paragraphs without a cached result are checked on the spot while the
+    pass's INLINE_SPELL_CHECK_BUDGET lasts, so an edited line keeps its
+    underlines; past it (a load, a big paste, a full refresh) they are
+    handed to request_check and painted once the worker's answer arrives.
+    """
+    
+    # Format for misspelled words, shared by every editor
+    ERROR_FORMAT = QTextCharFormat()
+    ERROR_FORMAT.setUnderlineStyle(QTextCharFormat.UnderlineStyle.SpellCheckUnderline)
+    ERROR_FORMAT.setUnderlineColor(QColor("#cc0000"))
+    
+    # Drop cached paragraph results past this many entries
+    MAX_RESULTS = 65536
+    
+    def __init__(self, document):
+        super().__init__(document)
+        self.spell_checker = None
+        # Whether any underline may currently be applied
+        self.has_highlights = False
+        # Paragraph text -> ((start, end), ...) misspelled ranges, and a counter
+        # bumped whenever they are dropped, so answers to older requests are ignored
+        self.results = {}
+        self.results_generation = 0
+        self.request_check = None
+        # Characters still allowed inline this pass; refilled on the next one
+        self.inline_budget = INLINE_SPELL_CHECK_BUDGET
+        self._budget_timer = QTimer(self)
+        self._budget_timer.setSingleShot(True)
+        self._budget_timer.setInterval(0)
+        self._budget_timer.timeout.connect(self._refill_budget)
+        # Set while a file streams in; one pass runs once loading is done
+        self.suspended = False
+    
+    def highlightBlock(self, text):
+        if self.suspended or not self.spell_checker or not self.spell_checker.is_enabled() or not text:
+            return
+        
+        ranges = self.results.get(text)
+        if ranges is None:
+            if len(text) > self.inline_budget:
+                if self.request_check:
+                    self.request_check(self.currentBlock(), text)
+                return
+            self.inline_budget -= len(text)
+            self._budget_timer.start()
+            ranges = tuple((start, end) for word, start, end
+                           in self.spell_checker.find_misspelled_words(text))
+            if len(self.results) >= self.MAX_RESULTS:
+                self.results.clear()
+            self.results[text] = ranges
+        
+        error_format = self.ERROR_FORMAT
+        for start, end in ranges:
+            self.setFormat(start, end - start, error_format)
+            self.has_highlights = True
+    
+    def _refill_budget(self):
+        self.inline_budget = INLINE_SPELL_CHECK_BUDGET
+    
+    def reset_results(self):
+        """Forget every cached result, including answers still on their way."""
+        self.results.clear()
+        self.results_generation += 1
+
+
 class EditorTab(QPlainTextEdit):
     """
     Enhanced text editor with spell checking and line numbers.
     """
     
     # Signals
-    text_changed_signal = pyqtSignal()
+    # The editor itself, so a receiver acting after the debounce doesn't assume it is current
+    text_changed_signal = pyqtSignal(object)
     cursor_position_changed = pyqtSignal()
+    # (results, blocks, generation) from a SpellCheckTask
+    misspellings_ready = pyqtSignal(object, object, int)
     
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -37,13 +154,66 @@ class EditorTab(QPlainTextEdit):
         # Properties
         self.file_path: Optional[str] = None
         self.is_modified = False
+        # Set while load_from_path streams a file in
+        self.loading = False
         self.custom_tab_name: Optional[str] = None
+        self._base_name = "Untitled"
         self.show_line_numbers = False
         self.spell_checker = None
-        self.misspelled_words = []
+        self.spell_highlighter = SpellHighlighter(self.document())
+        self.spell_highlighter.request_check = self.check_paragraph_async
+        
+        # Paragraphs awaiting a spell check, submitted together on the next loop pass
+        self._pending_blocks = {}
+        self._spell_batch_timer = QTimer(self)
+        self._spell_batch_timer.setSingleShot(True)
+        self._spell_batch_timer.setInterval(0)
+        self._spell_batch_timer.timeout.connect(self._submit_spell_batch)
+        self.misspellings_ready.connect(self.on_misspellings_ready)
+        # (block, text) pairs whose results arrived, repainted SPELL_REPAINT_STEP per idle step
+        self._spell_repaint_queue = deque()
+        self._spell_repaint_timer = QTimer(self)
+        self._spell_repaint_timer.setSingleShot(True)
+        self._spell_repaint_timer.setInterval(0)
+        self._spell_repaint_timer.timeout.connect(self._repaint_checked_blocks)
+        
+        # Visible-first spell refresh: next block number for the idle sweep
+        self._spellcheck_pending = False
+        self._spell_sweep_block = 0
+        self.verticalScrollBar().valueChanged.connect(self.on_scrolled)
+        
+        # Coalesce bursts of keystrokes into a single update
+        self._edit_timer = QTimer(self)
+        self._edit_timer.setSingleShot(True)
+        self._edit_timer.setInterval(150)
+        self._edit_timer.timeout.connect(self._flush_edit)
+        
+        # Used to drop textChanged notifications that are not real edits
+        self._last_revision = self.document().revision()
+        self._rehighlighting = False
+        # Edits to the text so far; highlighting passes bump document().revision() too
+        self._content_revision = 0
+        # (content revision, text) of the last toPlainText() copy
+        self._plain_text_cache = (-1, "")
+        
+        # Per-block (words, non-space chars, chars), kept in sync with edits
+        self._block_stats = [(0, 0, 0)]
+        self._block_count = 1
+        self._word_count = 0
+        self._non_space_count = 0
+        self._char_count = 0
+        self.document().contentsChange.connect(self.on_contents_change)
         
         # Line number area
         self.line_number_area = LineNumberArea(self)
+        # Cached gutter metrics, refreshed when the font or digit count changes
+        self._digit_advance = 0
+        self._last_digits = 0
+        self._line_number_width = 0
+        self._viewport_margin = 0
+        # Laid-out line number labels, reused across paints until the font changes
+        # (at most MAX_STATIC_TEXTS of them)
+        self._static_texts = {}
         
         # Connect signals
         self.textChanged.connect(self.on_text_changed)
@@ -61,39 +231,173 @@ class EditorTab(QPlainTextEdit):
     
     def on_text_changed(self):
         """Handle text changes."""
+        # Skip no-op notifications: unchanged revision or our own rehighlight pass
+        revision = self.document().revision()
+        if revision == self._last_revision or self._rehighlighting:
+            self._last_revision = revision
+            return
+        self._last_revision = revision
+        
         self.is_modified = True
-        self.text_changed_signal.emit()
+        self._edit_timer.start()
+    
+    def _flush_edit(self):
+        """Run the deferred work for a burst of edits."""
+        self.text_changed_signal.emit(self)
         
         # Update line numbers
         if self.show_line_numbers:
             self.update_line_number_area_width()
             self.update_line_number_area()
+    
+    def on_contents_change(self, position: int, chars_removed: int, chars_added: int):
+        """Recount only the blocks touched by an edit."""
+        self._content_revision += 1
+        document = self.document()
+        end = min(position + chars_added, document.characterCount() - 1)
+        first = document.findBlock(position)
+        last = document.findBlock(end)
+        start = first.blockNumber()
+        new_span = last.blockNumber() - start + 1
+        block_count = document.blockCount()
+        # Blocks after the edit are untouched, so the block count delta sizes the old range
+        old_span = new_span - (block_count - self._block_count)
+        self._block_count = block_count
+        
+        if new_span <= 64:
+            lines = []
+            block = first
+            for _ in range(new_span):
+                lines.append(block.text())
+                block = block.next()
+        else:
+            # Copy only the touched blocks; paragraphs come back split by U+2029
+            cursor = QTextCursor(document)
+            cursor.setPosition(first.position())
+            cursor.setPosition(last.position() + last.length() - 1, QTextCursor.MoveMode.KeepAnchor)
+            lines = cursor.selectedText().split('\u2029')
         
-        # Update spell checking (disabled by default to prevent performance issues)
-        # Uncomment to enable real-time spell checking:
-        # if self.spell_checker and self.spell_checker.is_enabled():
-        #     self.check_spelling()
+        count_line = TextAnalyzer.count_line
+        stats = [count_line(line) for line in lines]
+        old_stats = self._block_stats[start:start + old_span]
+        self._word_count += sum(s[0] for s in stats) - sum(s[0] for s in old_stats)
+        self._non_space_count += sum(s[1] for s in stats) - sum(s[1] for s in old_stats)
+        self._char_count += sum(s[2] for s in stats) - sum(s[2] for s in old_stats)
+        self._block_stats[start:start + old_span] = stats
+    
+    def get_text_stats(self) -> tuple:
+        """
+        Get running counts without traversing the document.
+        Returns (words, characters_with_spaces, characters_without_spaces).
+        """
+        # Every block but the last ends in a newline
+        return (self._word_count, self._char_count + self._block_count - 1, self._non_space_count)
     
     def on_cursor_changed(self):
         """Handle cursor position changes."""
         self.cursor_position_changed.emit()
     
     def get_content(self) -> str:
-        """Get editor content."""
-        return self.toPlainText()
+        """Get editor content (copied from the document at most once per edit)."""
+        revision = self._content_revision
+        cached_revision, text = self._plain_text_cache
+        if cached_revision != revision:
+            text = self.toPlainText()
+            self._plain_text_cache = (revision, text)
+        return text
+    
+    def content_revision(self) -> int:
+        """
+        Get a counter that moves on every change to the text (undo included).
+        Unlike document().revision() it stays put while spell highlighting
+        reformats blocks, so it suits keying caches of the text.
+        """
+        return self._content_revision
     
     def set_content(self, content: str):
         """Set editor content."""
         self.setPlainText(content)
         self.is_modified = False
     
+    def load_content_fast(self, content: str):
+        """
+        Set content for a freshly opened file.
+        Repaints, widget signals and undo recording are suspended around the
+        insert; the document's own signals still keep the counts current.
+        """
+        self.setUpdatesEnabled(False)
+        self.blockSignals(True)
+        self.setUndoRedoEnabled(False)
+        try:
+            self.setPlainText(content)
+        finally:
+            self.setUndoRedoEnabled(True)
+            self.blockSignals(False)
+            self.setUpdatesEnabled(True)
+        self._last_revision = self.document().revision()
+        self.is_modified = False
+    
+    def load_from_path(self, path: str) -> bool:
+        """
+        Stream a large file into the editor in STREAM_CHUNK_SIZE pieces,
+        keeping the event loop running between pieces.
+        The file is read and decoded in full first, so one that can't be read
+        leaves the editor untouched instead of holding part of it. loading is
+        True while the pieces go in; the tab must not be closed meanwhile.
+        Spell checking is held back until the whole file is in.
+        """
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = f.read()
+        except Exception as e:
+            print(f"Error reading file {path}: {e}")
+            return False
+        
+        highlighter = self.spell_highlighter
+        highlighter.suspended = True
+        self.loading = True
+        self.setReadOnly(True)
+        self.setUpdatesEnabled(False)
+        self.blockSignals(True)
+        self.setUndoRedoEnabled(False)
+        try:
+            self.clear()
+            cursor = QTextCursor(self.document())
+            for start in range(0, len(content), STREAM_CHUNK_SIZE):
+                cursor.movePosition(QTextCursor.MoveOperation.End)
+                cursor.insertText(content[start:start + STREAM_CHUNK_SIZE])
+                QCoreApplication.processEvents()
+        finally:
+            self.setUndoRedoEnabled(True)
+            self.blockSignals(False)
+            self.setUpdatesEnabled(True)
+            self.setReadOnly(False)
+            self.loading = False
+            highlighter.suspended = False
+            self._last_revision = self.document().revision()
+        
+        self.moveCursor(QTextCursor.MoveOperation.Start)
+        self.is_modified = False
+        self.check_spelling()
+        return True
+    
     def get_cursor_position(self) -> int:
         """Get current cursor position."""
         return self.textCursor().position()
     
+    def get_line_col(self) -> tuple:
+        """
+        Get cursor line and column number - both 1-indexed.
+        Uses the document's block index instead of rescanning the text.
+        """
+        cursor = self.textCursor()
+        return (cursor.blockNumber() + 1, cursor.positionInBlock() + 1)
+    
     def set_file_path(self, path: str):
         """Set associated file path."""
         self.file_path = path
+        # Basename is computed once here rather than on every title refresh
+        self._base_name = os.path.basename(path.replace('\\', '/')) if path else "Untitled"
         self.is_modified = False
     
     def get_file_path(self) -> Optional[str]:
@@ -106,11 +410,7 @@ class EditorTab(QPlainTextEdit):
     
     def get_display_name(self) -> str:
         """Get display name for tab."""
-        if self.custom_tab_name:
-            return self.custom_tab_name
-        if self.file_path:
-            return self.file_path.split('/')[-1].split('\\')[-1]
-        return "Untitled"
+        return self.custom_tab_name or self._base_name
     
     def mark_saved(self):
         """Mark document as saved."""
@@ -125,6 +425,13 @@ class EditorTab(QPlainTextEdit):
         
         self.setFont(font)
         self.setStyleSheet(f"color: {self.current_text_color.name()};")
+        
+        # Font changed: re-measure digit width and force a gutter recompute
+        self._digit_advance = self.fontMetrics().horizontalAdvance('9')
+        self._last_digits = 0
+        self._static_texts.clear()
+        if self.show_line_numbers:
+            self.update_line_number_area_width()
     
     def set_font_family(self, family: str):
         """Set font family."""
@@ -159,44 +466,141 @@ class EditorTab(QPlainTextEdit):
     def set_spell_checker(self, checker):
         """Set spell checker instance."""
         self.spell_checker = checker
+        self.spell_highlighter.spell_checker = checker
         if checker and checker.is_enabled():
             self.check_spelling()
     
     def check_spelling(self):
-        """Check spelling and highlight misspelled words."""
+        """Re-run spell check highlighting (clears underlines when disabled)."""
+        # Fast path: nothing to check and nothing to clear
+        active = self.spell_checker is not None and self.spell_checker.is_enabled()
+        if self.document().isEmpty() or (not active and not self.spell_highlighter.has_highlights):
+            return
+        
+        self.spell_highlighter.has_highlights = False
+        # Rehighlighting only touches formats; on_text_changed ignores it
+        self._rehighlighting = True
+        try:
+            self.spell_highlighter.rehighlight()
+        finally:
+            self._rehighlighting = False
+    
+    def check_paragraph_async(self, block, text: str):
+        """Queue a paragraph for checking on the shared thread pool."""
+        self._pending_blocks.setdefault(text, []).append(block)
+        self._spell_batch_timer.start()
+    
+    def _submit_spell_batch(self):
+        """Hand all queued paragraphs to one pool task."""
+        if not self._pending_blocks or not self.spell_checker:
+            return
+        blocks, self._pending_blocks = self._pending_blocks, {}
+        QThreadPool.globalInstance().start(
+            SpellCheckTask(self.spell_checker, blocks, self.spell_highlighter.results_generation,
+                           self.misspellings_ready))
+    
+    def on_misspellings_ready(self, results: dict, blocks: dict, generation: int):
+        """Store worker results and repaint the paragraphs that asked for them."""
+        highlighter = self.spell_highlighter
+        if generation != highlighter.results_generation:
+            return  # Asked before the cache was reset; the refresh asks again
+        if len(highlighter.results) + len(results) > highlighter.MAX_RESULTS:
+            highlighter.results.clear()
+        highlighter.results.update(results)
         if not self.spell_checker or not self.spell_checker.is_enabled():
             return
         
-        text = self.get_content()
-        self.misspelled_words = self.spell_checker.find_misspelled_words(text)
+        # Only the paragraphs that asked, a step at a time, so a big reply never
+        # turns into one long rehighlight on the GUI thread
+        self._spell_repaint_queue.extend((block, text) for text, text_blocks in blocks.items()
+                                         for block in text_blocks)
+        self._spell_repaint_timer.start()
+    
+    def _repaint_checked_blocks(self):
+        """Rehighlight the next SPELL_REPAINT_STEP queued paragraphs, then yield to the event loop."""
+        queue = self._spell_repaint_queue
+        highlighter = self.spell_highlighter
+        # Formatting only; on_text_changed ignores it
+        self._rehighlighting = True
+        try:
+            for _ in range(min(SPELL_REPAINT_STEP, len(queue))):
+                block, text = queue.popleft()
+                # Skip paragraphs edited or removed since they were queued
+                if block.isValid() and block.text() == text:
+                    highlighter.rehighlightBlock(block)
+        finally:
+            self._rehighlighting = False
+        if queue:
+            self._spell_repaint_timer.start()
+    
+    def begin_spell_refresh(self) -> bool:
+        """
+        Start re-running spell highlighting: the visible blocks right away, the
+        rest through spell_sweep_step(). Returns False when there is nothing to do.
+        """
+        active = self.spell_checker is not None and self.spell_checker.is_enabled()
+        if self.document().isEmpty() or (not active and not self.spell_highlighter.has_highlights):
+            return False
         
-        # Highlight misspelled words
-        self.highlight_misspelled_words()
+        # Checking was just turned on or the dictionary just loaded: anything
+        # cached while it was off or loading is stale
+        if active:
+            self.spell_highlighter.reset_results()
+        self._spellcheck_pending = True
+        self._spell_sweep_block = 0
+        self.refresh_visible_spelling()
+        return True
     
-    def highlight_misspelled_words(self):
-        """Highlight misspelled words with red underline."""
-        # Clear previous highlights
-        cursor = self.textCursor()
-        cursor.select(QTextCursor.SelectionType.Document)
+    def refresh_visible_spelling(self):
+        """Rehighlight just the blocks currently on screen."""
+        last = self.cursorForPosition(self.viewport().rect().bottomRight()).block()
+        self._rehighlight_blocks(self.firstVisibleBlock(), last.blockNumber() + 1)
+    
+    def spell_sweep_step(self, max_blocks: int = 500) -> bool:
+        """Rehighlight the next max_blocks blocks of a pending refresh; True once finished."""
+        if not self._spellcheck_pending:
+            return True
         
-        # Create format for misspelled words
-        error_format = QTextCharFormat()
-        error_format.setUnderlineStyle(QTextCharFormat.UnderlineStyle.SpellCheckUnderline)
-        error_format.setUnderlineColor(QColor("#cc0000"))
+        start = self._spell_sweep_block
+        self._spell_sweep_block = start + max_blocks
+        self._rehighlight_blocks(self.document().findBlockByNumber(start), self._spell_sweep_block)
+        if self._spell_sweep_block < self.document().blockCount():
+            return False
         
-        # Apply highlights
-        for word, start, end in self.misspelled_words:
-            cursor.setPosition(start)
-            cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
-            cursor.mergeCharFormat(error_format)
+        self._spellcheck_pending = False
+        if not self.spell_checker or not self.spell_checker.is_enabled():
+            # Every block has been re-run with checking off, so no underline is left
+            self.spell_highlighter.has_highlights = False
+        return True
+    
+    def _rehighlight_blocks(self, block, stop_number: int):
+        """Rehighlight from block up to (not including) block number stop_number."""
+        number = block.blockNumber()
+        # Formatting only; on_text_changed ignores it
+        self._rehighlighting = True
+        try:
+            while block.isValid() and number < stop_number:
+                self.spell_highlighter.rehighlightBlock(block)
+                block = block.next()
+                number += 1
+        finally:
+            self._rehighlighting = False
+    
+    def on_scrolled(self, value: int):
+        """Bring newly visible blocks up to date while a spell refresh is pending."""
+        if self._spellcheck_pending:
+            self.refresh_visible_spelling()
     
     def set_show_line_numbers(self, show: bool):
         """Toggle line number display."""
+        if show == self.show_line_numbers:
+            return
         self.show_line_numbers = show
         if show:
             self.update_line_number_area_width()
             self.line_number_area.show()
         else:
+            self._viewport_margin = 0
             self.setViewportMargins(0, 0, 0, 0)
             self.line_number_area.hide()
     
@@ -206,12 +610,17 @@ class EditorTab(QPlainTextEdit):
             return 0
         
         digits = len(str(max(1, self.document().blockCount())))
-        space = 10 + self.fontMetrics().horizontalAdvance('9') * digits
-        return space
+        if digits != self._last_digits:
+            self._last_digits = digits
+            self._line_number_width = 10 + self._digit_advance * digits
+        return self._line_number_width
     
     def update_line_number_area_width(self):
         """Update left margin for line numbers."""
-        self.setViewportMargins(self.line_number_area_width(), 0, 0, 0)
+        width = self.line_number_area_width()
+        if width != self._viewport_margin:
+            self._viewport_margin = width
+            self.setViewportMargins(width, 0, 0, 0)
     
     def update_line_number_area(self, rect=None, dy=0):
         """Update line number area when scrolling."""
@@ -252,13 +661,23 @@ class EditorTab(QPlainTextEdit):
         top = int(self.blockBoundingGeometry(block).translated(self.contentOffset()).top())
         bottom = top + int(self.blockBoundingRect(block).height())
         
+        right = self.line_number_area.width() - 5
+        static_texts = self._static_texts
+        
         # Draw line numbers for all visible blocks
         while block.isValid() and top <= event.rect().bottom():
             if block.isVisible() and bottom >= event.rect().top():
-                number = str(block_number + 1)
-                painter.drawText(0, top, self.line_number_area.width() - 5,
-                               self.fontMetrics().height(),
-                               Qt.AlignmentFlag.AlignRight, number)
+                number = block_number + 1
+                static = static_texts.get(number)
+                if static is None:
+                    if len(static_texts) >= MAX_STATIC_TEXTS:
+                        static_texts.clear()
+                    static = QStaticText(str(number))
+                    static.setTextFormat(Qt.TextFormat.PlainText)
+                    static.prepare(font=painter.font())
+                    static_texts[number] = static
+                # Right-aligned, as drawText with AlignRight did
+                painter.drawStaticText(int(right - static.size().width()), top, static)
             
             block = block.next()
             top = bottom
@@ -0,0 +1,57 @@
+"""
+Find & Replace dialog for Kun text editor.
+Kept in its own module so it is only imported when Replace is opened.
+"""
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
+                             QCheckBox, QPushButton)
+
+
+class FindReplaceDialog(QDialog):
+    """Dialog for Find & Replace functionality."""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Find and Replace")
+        self.setup_ui()
+    
+    def setup_ui(self):
+        layout = QVBoxLayout()
+        
+        # Find field
+        find_layout = QHBoxLayout()
+        find_layout.addWidget(QLabel("Find:"))
+        self.find_input = QLineEdit()
+        find_layout.addWidget(self.find_input)
+        layout.addLayout(find_layout)
+        
+        # Replace field
+        replace_layout = QHBoxLayout()
+        replace_layout.addWidget(QLabel("Replace:"))
+        self.replace_input = QLineEdit()
+        replace_layout.addWidget(self.replace_input)
+        layout.addLayout(replace_layout)
+        
+        # Options
+        self.case_sensitive = QCheckBox("Case sensitive")
+        self.whole_words = QCheckBox("Match whole words")
+        self.wrap_around = QCheckBox("Wrap around")
+        self.wrap_around.setChecked(True)
+        
+        layout.addWidget(self.case_sensitive)
+        layout.addWidget(self.whole_words)
+        layout.addWidget(self.wrap_around)
+        
+        # Buttons
+        button_layout = QHBoxLayout()
+        self.find_next_btn = QPushButton("Find Next")
+        self.find_prev_btn = QPushButton("Find Previous")
+        self.replace_btn = QPushButton("Replace")
+        self.replace_all_btn = QPushButton("Replace All")
+        
+        button_layout.addWidget(self.find_next_btn)
+        button_layout.addWidget(self.find_prev_btn)
+        button_layout.addWidget(self.replace_btn)
+        button_layout.addWidget(self.replace_all_btn)
+        layout.addLayout(button_layout)
+        
+        self.setLayout(layout)
@@ -5,73 +5,155 @@ Contains menu bar, tab widget, and status bar.
 from PyQt6.QtWidgets import (QMainWindow, QTabWidget, QMenuBar, QMenu, QStatusBar,
                              QFileDialog, QMessageBox, QInputDialog, QDialog, QVBoxLayout,
                              QHBoxLayout, QLabel, QComboBox, QSpinBox, QPushButton,
-                             QCheckBox, QColorDialog, QLineEdit, QRadioButton, QButtonGroup, QWidget)
-from PyQt6.QtCore import Qt, QTimer, QUrl
-from PyQt6.QtGui import QAction, QKeySequence, QFont, QColor, QDragEnterEvent, QDropEvent, QTextCursor
+                             QCheckBox, QColorDialog, QLineEdit, QRadioButton, QButtonGroup, QWidget,
+                             QTextEdit, QApplication)
+from PyQt6.QtCore import (Qt, QTimer, QUrl, pyqtSignal, QRunnable, QThreadPool, QObject, QThread,
+                          QRegularExpression)
+from PyQt6.QtGui import (QAction, QKeySequence, QFont, QColor, QDragEnterEvent, QDropEvent, QTextCursor,
+                         QTextDocument, QTextCharFormat, QShortcut)
 import os
+import re
+import weakref
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
 from pathlib import Path
 
 from ui.editor_tab import EditorTab
 from ui.theme_manager import ThemeManager
 from core.file_ops import FileOperations
 from core.text_analyzer import TextAnalyzer
+from core.find_engine import compile_literal, find_literal
 from core.spell_checker import BasicSpellChecker
 
 
-class FindReplaceDialog(QDialog):
-    """Dialog for Find & Replace functionality."""
+# Highlighting more matches than this only costs memory; they are still navigable
+MAX_FIND_HIGHLIGHTS = 5000
+
+# Queries shorter than this only search on Enter / Search, not on a Match Case toggle
+MIN_LIVE_FIND_LENGTH = 3
+
+# Dialog searches over documents larger than this (characters) run on the find thread
+ASYNC_FIND_SIZE = 1_000_000
+
+# Replace All edits up to this many matches in place; more are replaced in one text pass
+REPLACE_IN_PLACE_LIMIT = 1000
+
+# Files larger than this (bytes) are streamed into the editor instead of set in one go
+LARGE_FILE_SIZE = 1024 * 1024
+
+# File extensions accepted when dropped onto the window
+_ALLOWED_EXT = frozenset({'.txt', '.md', '.log'})
+
+# Characters outside the BMP take two UTF-16 units in a QTextDocument
+_ASTRAL_RE = re.compile('[\U00010000-\U0010FFFF]')
+
+# Quick text colors in the font dialog, with their swatch stylesheets built once
+_PRESET_COLORS = ("#e0e0e0", "#ffffff", "#ff6b6b", "#4ecdc4", "#45b7d1", "#feca57", "#ee5a6f", "#c7ecee")
+_PRESET_STYLESHEETS = {color: f"background-color: {color}; border: 1px solid #666; border-radius: 3px;"
+                       for color in _PRESET_COLORS}
+
+
+@lru_cache(maxsize=32)
+def _preview_style(color_hex: str) -> str:
+    """Stylesheet for the font dialog's current-color swatch."""
+    return f"background-color: {color_hex}; border: 2px solid #666; border-radius: 4px;"
+
+
+class AutoSaveTask(QRunnable):
+    """
+    Writes a batch of autosave snapshots on a pool thread, reporting each
+    one through on_done(editor, revision, file_path, saved).
+    """
     
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setWindowTitle("Find and Replace")
-        self.setup_ui()
+    def __init__(self, file_ops, jobs: list, durable: bool, on_done):
+        super().__init__()
+        self.file_ops = file_ops
+        self.jobs = jobs
+        self.durable = durable
+        self.on_done = on_done
     
-    def setup_ui(self):
-        layout = QVBoxLayout()
-        
-        # Find field
-        find_layout = QHBoxLayout()
-        find_layout.addWidget(QLabel("Find:"))
-        self.find_input = QLineEdit()
-        find_layout.addWidget(self.find_input)
-        layout.addLayout(find_layout)
-        
-        # Replace field
-        replace_layout = QHBoxLayout()
-        replace_layout.addWidget(QLabel("Replace:"))
-        self.replace_input = QLineEdit()
-        replace_layout.addWidget(self.replace_input)
-        layout.addLayout(replace_layout)
-        
-        # Options
-        self.case_sensitive = QCheckBox("Case sensitive")
-        self.whole_words = QCheckBox("Match whole words")
-        self.wrap_around = QCheckBox("Wrap around")
-        self.wrap_around.setChecked(True)
-        
-        layout.addWidget(self.case_sensitive)
-        layout.addWidget(self.whole_words)
-        layout.addWidget(self.wrap_around)
-        
-        # Buttons
-        button_layout = QHBoxLayout()
-        self.find_next_btn = QPushButton("Find Next")
-        self.find_prev_btn = QPushButton("Find Previous")
-        self.replace_btn = QPushButton("Replace")
-        self.replace_all_btn = QPushButton("Replace All")
-        
-        button_layout.addWidget(self.find_next_btn)
-        button_layout.addWidget(self.find_prev_btn)
-        button_layout.addWidget(self.replace_btn)
-        button_layout.addWidget(self.replace_all_btn)
-        layout.addLayout(button_layout)
-        
-        self.setLayout(layout)
+    def run(self):
+        for editor, revision, file_path, content in self.jobs:
+            saved = self.file_ops.write_file_atomic(file_path, content, self.durable)
+            self.on_done(editor, revision, file_path, saved)
+
+
+class FindWorker(QObject):
+    """Collects find matches on a background thread for large documents."""
+    
+    # (generation, positions) for a finished request
+    matches_ready = pyqtSignal(int, object)
+    
+    def __init__(self, collect):
+        super().__init__()
+        self.collect = collect
+        # Latest generation asked for; older requests are dropped unrun or unreported
+        self.generation = 0
+    
+    def run(self, generation: int, text: str, search_text: str, case_sensitive: bool, whole_words: bool):
+        if generation != self.generation:
+            return
+        positions = self.collect(text, search_text, case_sensitive, whole_words)
+        if generation == self.generation:
+            self.matches_ready.emit(generation, positions)
+
+
+@lru_cache(maxsize=8)
+def _qt_literal(text: str, whole_words: bool) -> QRegularExpression:
+    """
+    Build a QRegularExpression matching text literally, for QTextDocument.find
+    (which sets case sensitivity itself from its FindCaseSensitively flag).
+    Whole words use the same lookarounds as compile_literal; Unicode properties
+    make \\W cover non-ASCII letters like Python's re.
+    """
+    body = QRegularExpression.escape(text)
+    if whole_words:
+        body = rf'(?<![^\W_]){body}(?![^\W_])'
+    return QRegularExpression(body, QRegularExpression.PatternOption.UseUnicodePropertiesOption)
+
+
+@lru_cache(maxsize=32)
+def _can_overlap(text: str) -> bool:
+    """
+    Whether two matches of text can overlap, i.e. some proper prefix of it is
+    also a suffix ("aa", "abca"). Checked case-folded, which also covers the
+    case-sensitive search. Without overlaps every match is in the scanned
+    (non-overlapping) match list, so stepping through that list lands exactly
+    where QTextDocument.find would.
+    """
+    folded = text.casefold()
+    return any(folded.endswith(folded[:length]) for length in range(1, len(folded)))
+
+
+def _count_replace(text: str, search_text: str, replace_text: str,
+                   case_sensitive: bool, whole_words: bool) -> tuple:
+    """
+    Replace every occurrence of search_text in text.
+    Returns (new_text, count); whole words follow QTextDocument's rule that
+    the match may not touch a letter or digit on either side.
+    """
+    if case_sensitive and not whole_words:
+        count = text.count(search_text)
+        return (text.replace(search_text, replace_text), count) if count else (text, 0)
+    
+    return compile_literal(search_text, case_sensitive, whole_words).subn(
+        lambda match: replace_text, text)
 
 
 class MainWindow(QMainWindow):
     """Main application window."""
     
+    # Format for find matches, shared by every search
+    FIND_HIGHLIGHT_FORMAT = QTextCharFormat()
+    FIND_HIGHLIGHT_FORMAT.setBackground(QColor(255, 255, 0, 120))  # Yellow highlight
+    
+    # Emitted from the spell checker's loader thread; delivered queued to the GUI thread
+    spell_checker_ready = pyqtSignal()
+    # (editor, revision, file_path, saved) for each autosave write, from the autosave pool
+    autosave_done = pyqtSignal(object, int, str, bool)
+    # (generation, text, search_text, case_sensitive, whole_words) for the find thread
+    find_requested = pyqtSignal(int, str, str, bool, bool)
+    
     def __init__(self):
         super().__init__()
         
@@ -81,7 +163,8 @@ class MainWindow(QMainWindow):
         # Initialize managers
         self.file_ops = FileOperations()
         self.theme_manager = ThemeManager()
-        self.spell_checker = BasicSpellChecker()
+        self.spell_checker_ready.connect(self.on_spell_checker_ready)
+        self.spell_checker = BasicSpellChecker(on_ready=self.spell_checker_ready.emit)
         self.text_analyzer = TextAnalyzer()
         
         # Untitled counter
@@ -91,19 +174,76 @@ class MainWindow(QMainWindow):
         self.find_matches = []
         self.current_match_index = -1
         self.find_widget = None
+        # (editor, search_text, case_sensitive, revision) of the last full scan
+        self._find_cache_key = None
+        # (editor, count, first, last) of the highlights currently shown
+        self._applied_highlights = None
+        # Find & Replace dialog matches, shared by Next/Previous/Replace/Replace All and
+        # rebuilt only when the query, its flags or the text change
+        self._find_state = {'editor': None, 'query': None, 'flags': None, 'rev': -1, 'positions': []}
+        # Background search thread, started on the first large search
+        self._find_thread = None
+        self._find_worker = None
+        self._find_continuation = None
+        
+        # Coalesce rapid Match Case toggles into one scan
+        self._find_debounce = QTimer(self)
+        self._find_debounce.setSingleShot(True)
+        self._find_debounce.setInterval(150)
+        self._find_debounce.timeout.connect(self.perform_find)
+        
+        # Coalesce status bar refreshes (tab switches, opens, mode toggles) into one stats pass
+        self._status_timer = QTimer(self)
+        self._status_timer.setSingleShot(True)
+        self._status_timer.setInterval(120)
+        self._status_timer.timeout.connect(self._really_update_status_bar)
+        
+        # Idle spell refresh across tabs, one sweep step per event loop pass
+        self._spellcheck_queue = []
+        self._spellcheck_timer = QTimer(self)
+        self._spellcheck_timer.setSingleShot(True)
+        self._spellcheck_timer.setInterval(0)
+        self._spellcheck_timer.timeout.connect(self._spellcheck_next_chunk)
+        
+        # Font settings dialog, built on first use and reused after that
+        self._font_dialog = None
         
         # Auto-save timer
         self.auto_save_timer = QTimer()
         self.auto_save_timer.timeout.connect(self.auto_save_all)
+        # Content revision each editor had at its last successful autosave, and the
+        # one being written now
+        self._last_saved_revision = weakref.WeakKeyDictionary()
+        self._autosave_pending = weakref.WeakKeyDictionary()
+        # Autosaves run one at a time on their own thread, so two writes of the
+        # same file never overlap; manual saves wait for it to go idle first
+        self._autosave_pool = QThreadPool(self)
+        self._autosave_pool.setMaxThreadCount(1)
+        self.autosave_done.connect(self._on_autosaved)
+        # Restored tabs whose file is read only once the tab is first shown
+        self._deferred_paths = weakref.WeakKeyDictionary()
+        self._restoring = False
+        # Set while a large file streams in; files opened meanwhile wait their turn
+        self._streaming = False
+        self._queued_opens = []
+        # Session entry each editor produced last time, with the revision it was taken at
+        self._session_entries = weakref.WeakKeyDictionary()
+        if self.file_ops.get_setting('auto_save', False):
+            self.auto_save_timer.start(self.file_ops.get_setting('auto_save_interval', 30) * 1000)
         
         # Character count mode
         self.char_count_with_spaces = self.file_ops.get_setting('char_count_mode', 'with_spaces') == 'with_spaces'
         
-        # Setup UI
-        self.setup_ui()
-        self.setup_menus()
-        self.setup_status_bar()
-        self.apply_theme(self.file_ops.get_setting('theme', 'noir'))
+        # Theme and stylesheet last applied, so repeat applies can be skipped
+        self._current_theme_id = None
+        self._current_stylesheet = None
+        
+        # Setup UI (config writes made during startup are flushed once)
+        with self.file_ops.batch():
+            self.setup_ui()
+            self.setup_menus()
+            self.setup_status_bar()
+            self.apply_theme(self.file_ops.get_setting('theme', 'noir'))
         
         # Enable drag and drop
         self.setAcceptDrops(True)
@@ -122,14 +262,16 @@ class MainWindow(QMainWindow):
         self.tab_widget.setTabsClosable(True)
         self.tab_widget.setMovable(True)
         self.tab_widget.setDocumentMode(True)
+        # Editors in tab order, kept in step with adds, closes and drags
+        self._editors = []
         
         # Connect tab signals
+        self.tab_widget.tabBar().tabMoved.connect(self._on_tab_moved)
         self.tab_widget.tabCloseRequested.connect(self.close_tab)
         self.tab_widget.currentChanged.connect(self.on_tab_changed)
         self.tab_widget.tabBarDoubleClicked.connect(self.rename_tab)
         
         # Add '+' button for new tabs
-        from PyQt6.QtWidgets import QPushButton
         self.new_tab_button = QPushButton("+")
         self.new_tab_button.setToolTip("New Tab (Ctrl+T)")
         self.new_tab_button.clicked.connect(self.new_tab)
@@ -181,7 +323,7 @@ class MainWindow(QMainWindow):
         
         save_action = QAction("Save", self)
         save_action.setShortcut(QKeySequence("Ctrl+S"))
-        save_action.triggered.connect(self.save_file)
+        save_action.triggered.connect(lambda: self.save_file())
         file_menu.addAction(save_action)
         
         save_as_action = QAction("Save As...", self)
@@ -193,7 +335,8 @@ class MainWindow(QMainWindow):
         
         # Open Recent submenu
         self.recent_menu = file_menu.addMenu("Open Recent")
-        self.update_recent_menu()
+        # Built on demand, right before the menu opens
+        self.recent_menu.aboutToShow.connect(self._rebuild_recent_menu)
         
         file_menu.addSeparator()
         
@@ -205,37 +348,31 @@ class MainWindow(QMainWindow):
         # Edit Menu
         edit_menu = menubar.addMenu("&Edit")
         
-        undo_action = QAction("Undo", self)
-        undo_action.setShortcut(QKeySequence("Ctrl+Z"))
-        undo_action.triggered.connect(lambda: self.get_current_editor().undo())
-        edit_menu.addAction(undo_action)
+        self.undo_action = QAction("Undo", self)
+        self.undo_action.setShortcut(QKeySequence("Ctrl+Z"))
+        edit_menu.addAction(self.undo_action)
         
-        redo_action = QAction("Redo", self)
-        redo_action.setShortcut(QKeySequence("Ctrl+Y"))
-        redo_action.triggered.connect(lambda: self.get_current_editor().redo())
-        edit_menu.addAction(redo_action)
+        self.redo_action = QAction("Redo", self)
+        self.redo_action.setShortcut(QKeySequence("Ctrl+Y"))
+        edit_menu.addAction(self.redo_action)
         
         edit_menu.addSeparator()
         
-        cut_action = QAction("Cut", self)
-        cut_action.setShortcut(QKeySequence("Ctrl+X"))
-        cut_action.triggered.connect(lambda: self.get_current_editor().cut())
-        edit_menu.addAction(cut_action)
+        self.cut_action = QAction("Cut", self)
+        self.cut_action.setShortcut(QKeySequence("Ctrl+X"))
+        edit_menu.addAction(self.cut_action)
         
-        copy_action = QAction("Copy", self)
-        copy_action.setShortcut(QKeySequence("Ctrl+C"))
-        copy_action.triggered.connect(lambda: self.get_current_editor().copy())
-        edit_menu.addAction(copy_action)
+        self.copy_action = QAction("Copy", self)
+        self.copy_action.setShortcut(QKeySequence("Ctrl+C"))
+        edit_menu.addAction(self.copy_action)
         
-        paste_action = QAction("Paste", self)
-        paste_action.setShortcut(QKeySequence("Ctrl+V"))
-        paste_action.triggered.connect(lambda: self.get_current_editor().paste())
-        edit_menu.addAction(paste_action)
+        self.paste_action = QAction("Paste", self)
+        self.paste_action.setShortcut(QKeySequence("Ctrl+V"))
+        edit_menu.addAction(self.paste_action)
         
-        select_all_action = QAction("Select All", self)
-        select_all_action.setShortcut(QKeySequence("Ctrl+A"))
-        select_all_action.triggered.connect(lambda: self.get_current_editor().selectAll())
-        edit_menu.addAction(select_all_action)
+        self.select_all_action = QAction("Select All", self)
+        self.select_all_action.setShortcut(QKeySequence("Ctrl+A"))
+        edit_menu.addAction(self.select_all_action)
         
         edit_menu.addSeparator()
         
@@ -313,17 +450,9 @@ class MainWindow(QMainWindow):
         # View Menu
         view_menu = menubar.addMenu("&View")
         
-        # Theme submenu
-        theme_submenu = view_menu.addMenu("🎨 Theme")
-        for theme_id in self.theme_manager.get_theme_ids():
-            theme_data = self.theme_manager.get_theme(theme_id)
-            theme_name = theme_data.get('name', theme_id)
-            theme_desc = theme_data.get('description', '')
-            theme_action = QAction(theme_name, self)
-            if theme_desc:
-                theme_action.setToolTip(theme_desc)
-            theme_action.triggered.connect(lambda checked, tid=theme_id: self.apply_theme(tid))
-            theme_submenu.addAction(theme_action)
+        # Theme submenu (filled the first time it opens, so startup parses only the active theme)
+        self.theme_menu = view_menu.addMenu("🎨 Theme")
+        self.theme_menu.aboutToShow.connect(self._build_theme_menu)
         
         view_menu.addSeparator()
         
@@ -393,7 +522,7 @@ class MainWindow(QMainWindow):
         
         if file_path:
             editor.set_file_path(file_path)
-            editor.set_content(content)
+            editor.load_content_fast(content)
             tab_name = os.path.basename(file_path)
         else:
             tab_name = f"Untitled-{self.untitled_counter}"
@@ -401,8 +530,9 @@ class MainWindow(QMainWindow):
         
         # Connect editor signals
         editor.text_changed_signal.connect(self.on_editor_text_changed)
-        editor.cursor_position_changed.connect(self.update_status_bar)
+        editor.cursor_position_changed.connect(self.update_cursor_position)
         
+        self._editors.append(editor)
         index = self.tab_widget.addTab(editor, tab_name)
         self.tab_widget.setCurrentIndex(index)
         
@@ -419,6 +549,11 @@ class MainWindow(QMainWindow):
         
         editor = self.tab_widget.widget(index)
         
+        # A tab can't go away while its file is still streaming in
+        if editor.loading:
+            self.statusBar().showMessage("Still loading; close the tab once it has opened", 3000)
+            return
+        
         # Check for unsaved changes
         if editor.is_modified:
             reply = QMessageBox.question(
@@ -430,34 +565,65 @@ class MainWindow(QMainWindow):
             )
             
             if reply == QMessageBox.StandardButton.Save:
-                self.save_file()
+                self.save_file(index)
             elif reply == QMessageBox.StandardButton.Cancel:
                 return
         
+        self._editors.remove(editor)
         self.tab_widget.removeTab(index)
         
         # Create new tab if none left
         if self.tab_widget.count() == 0:
             self.new_tab()
     
+    def _on_tab_moved(self, from_index: int, to_index: int):
+        """Follow a tab dragged to a new position."""
+        self._editors.insert(to_index, self._editors.pop(from_index))
+    
+    def iter_editors(self):
+        """Iterate over the open editors in tab order."""
+        return iter(self._editors)
+    
     def on_tab_changed(self, index: int):
         """Handle tab change."""
         if index >= 0:
             editor = self.tab_widget.widget(index)
             file_name = editor.get_display_name()
             self.setWindowTitle(f"{file_name} – Kun")
+            if not self._restoring:
+                self.load_deferred(editor)
+            editor.set_show_line_numbers(self.file_ops.get_setting('show_line_numbers', False))
+            self.bind_edit_actions(editor)
             self.update_status_bar()
+        else:
+            self.bind_edit_actions(None)
     
-    def on_editor_text_changed(self):
-        """Handle editor text changes."""
-        editor = self.get_current_editor()
-        if editor:
-            index = self.tab_widget.currentIndex()
+    def bind_edit_actions(self, editor):
+        """Connect the Edit menu actions straight to the current editor's slots."""
+        for action, slot_name in ((self.undo_action, 'undo'), (self.redo_action, 'redo'),
+                                  (self.cut_action, 'cut'), (self.copy_action, 'copy'),
+                                  (self.paste_action, 'paste'), (self.select_all_action, 'selectAll')):
+            try:
+                action.triggered.disconnect()
+            except TypeError:
+                pass  # Nothing connected yet
+            if editor:
+                action.triggered.connect(getattr(editor, slot_name))
+    
+    def on_editor_text_changed(self, editor: EditorTab = None):
+        """Handle editor text changes (of the given editor, else the current one)."""
+        if editor is None:
+            editor = self.get_current_editor()
+        index = self.tab_widget.indexOf(editor) if editor else -1
+        if index >= 0:
             tab_name = editor.get_display_name()
             if editor.is_modified:
                 tab_name += " *"
             self.tab_widget.setTabText(index, tab_name)
-            self.update_status_bar()
+            # The editor already debounces keystrokes, so refresh right away;
+            # the user may have switched tabs since the edit
+            if index == self.tab_widget.currentIndex():
+                self._really_update_status_bar()
     
     def rename_tab(self, index: int):
         """Rename tab (custom name only, doesn't affect file)."""
@@ -482,45 +648,114 @@ class MainWindow(QMainWindow):
             self, "Open File", "", "Text Files (*.txt);;All Files (*.*)"
         )
         
-        for file_path in file_paths:
-            self.open_file_path(file_path)
+        if not file_paths:
+            return
+        
+        QApplication.setOverrideCursor(Qt.CursorShape.WaitCursor)
+        try:
+            with self.file_ops.batch():
+                for file_path in file_paths:
+                    self.open_file_path(file_path)
+                    # Let the UI repaint between files
+                    QApplication.processEvents()
+        finally:
+            QApplication.restoreOverrideCursor()
     
     def open_file_path(self, file_path: str):
         """Open specific file."""
+        # Opened once the file streaming in now is done
+        if self._streaming:
+            self._queued_opens.append(file_path)
+            return
+        
         if not os.path.exists(file_path):
             QMessageBox.warning(self, "File Not Found", f"File not found: {file_path}")
             return
         
+        # Big files are streamed in chunks so the window stays responsive
+        if os.path.getsize(file_path) > LARGE_FILE_SIZE:
+            editor = self.new_tab(file_path)
+            if not self._stream_file(editor, file_path):
+                self._editors.remove(editor)
+                self.tab_widget.removeTab(self.tab_widget.indexOf(editor))
+                QMessageBox.warning(self, "Open Failed", f"Could not read file: {file_path}")
+                return
+            self.update_status_bar()
+            self.file_ops.add_recent_file(file_path)
+            return
+        
         content = self.file_ops.read_file(file_path)
         if content is not None:
             self.new_tab(file_path, content)
             self.file_ops.add_recent_file(file_path)
-            self.update_recent_menu()
+        else:
+            QMessageBox.warning(self, "Open Failed", f"Could not read file: {file_path}")
+    
+    def _stream_file(self, editor, file_path: str) -> bool:
+        """
+        Stream a large file into editor. The loader keeps the event loop
+        running, so opens and deferred loads asked for meanwhile are put off
+        until it is done instead of starting a load inside this one.
+        """
+        self._streaming = True
+        try:
+            loaded = editor.load_from_path(file_path)
+        finally:
+            self._streaming = False
+        QTimer.singleShot(0, self._after_stream)
+        return loaded
     
-    def save_file(self):
-        """Save current file."""
+    def _after_stream(self):
+        """Run the loads that were put off while a file streamed in."""
         editor = self.get_current_editor()
-        if not editor:
+        if editor:
+            self.load_deferred(editor)
+        queued, self._queued_opens = self._queued_opens, []
+        for file_path in queued:
+            self.open_file_path(file_path)
+    
+    def _still_loading(self, editor) -> bool:
+        """
+        Whether editor's file is still streaming in. The loader runs the event
+        loop between pieces and read-only doesn't stop programmatic edits, so
+        saves and replaces check this rather than act on half a document.
+        """
+        if editor.loading:
+            self.statusBar().showMessage("Still loading; try again once the file has opened", 3000)
+            return True
+        return False
+    
+    def save_file(self, index: int = None):
+        """Save the file in the given tab (the current one by default)."""
+        if index is None:
+            index = self.tab_widget.currentIndex()
+        editor = self.tab_widget.widget(index)
+        if not editor or self._still_loading(editor):
             return
         
         file_path = editor.get_file_path()
         
-        # If no file path, use Save As with the renamed tab name as default
+        # If no file path, use Save As with the renamed tab name as default;
+        # that dialog works on the current tab, so only then switch to it
         if not file_path:
+            self.tab_widget.setCurrentIndex(index)
             self.save_file_as()
         else:
             content = editor.get_content()
+            # Let a pending autosave of this file land first rather than race it
+            self._autosave_pool.waitForDone()
             if self.file_ops.write_file(file_path, content):
                 editor.mark_saved()
                 self.file_ops.add_recent_file(file_path)
-                self.update_recent_menu()
-                self.on_editor_text_changed()
+                self.tab_widget.setTabText(index, editor.get_display_name())
+                if index == self.tab_widget.currentIndex():
+                    self.on_editor_text_changed()
                 self.statusBar().showMessage(f"Saved: {file_path}", 3000)
     
     def save_file_as(self):
         """Save file as new path."""
         editor = self.get_current_editor()
-        if not editor:
+        if not editor or self._still_loading(editor):
             return
         
         # Use custom tab name as default filename if available
@@ -534,11 +769,11 @@ class MainWindow(QMainWindow):
         
         if file_path:
             content = editor.get_content()
+            self._autosave_pool.waitForDone()
             if self.file_ops.write_file(file_path, content):
                 editor.set_file_path(file_path)
                 editor.mark_saved()
                 self.file_ops.add_recent_file(file_path)
-                self.update_recent_menu()
                 
                 # Update tab name
                 index = self.tab_widget.currentIndex()
@@ -546,50 +781,56 @@ class MainWindow(QMainWindow):
                 self.setWindowTitle(f"{os.path.basename(file_path)} – Kun")
                 self.statusBar().showMessage(f"Saved: {file_path}", 3000)
     
-    def update_recent_menu(self):
-        """Update recent files menu."""
+    def _rebuild_recent_menu(self):
+        """Rebuild recent files menu (runs when the menu is about to show)."""
         self.recent_menu.clear()
         
         recent_files = self.file_ops.get_recent_files()
         
         if not recent_files:
-            no_recent = QAction("No recent files", self)
+            no_recent = self.recent_menu.addAction("No recent files")
             no_recent.setEnabled(False)
-            self.recent_menu.addAction(no_recent)
         else:
             for file_path in recent_files:
-                action = QAction(os.path.basename(file_path), self)
+                action = self.recent_menu.addAction(os.path.basename(file_path))
                 action.setToolTip(file_path)
-                action.triggered.connect(lambda checked, fp=file_path: self.open_file_path(fp))
-                self.recent_menu.addAction(action)
+                action.setData(file_path)
+                action.triggered.connect(self._on_recent_triggered)
             
             self.recent_menu.addSeparator()
-            clear_action = QAction("Clear Recent Files", self)
+            clear_action = self.recent_menu.addAction("Clear Recent Files")
             clear_action.triggered.connect(self.clear_recent_files)
-            self.recent_menu.addAction(clear_action)
+    
+    def _on_recent_triggered(self):
+        """Open the file stored on the triggering recent-files action."""
+        self.open_file_path(self.sender().data())
     
     def clear_recent_files(self):
         """Clear recent files list."""
         self.file_ops.clear_recent_files()
-        self.update_recent_menu()
     
     def update_status_bar(self):
+        """Schedule a status bar refresh; line/col is updated immediately."""
+        self.update_cursor_position()
+        self._status_timer.start()
+    
+    def _really_update_status_bar(self):
         """Update status bar with current statistics."""
+        self._status_timer.stop()
         editor = self.get_current_editor()
         if not editor:
             return
         
-        text = editor.get_content()
-        cursor_pos = editor.get_cursor_position()
+        # Counts are maintained incrementally by the editor, so nothing is rescanned here
+        words, chars_with_spaces, chars_without_spaces = editor.get_text_stats()
         
-        stats = self.text_analyzer.get_statistics(text, cursor_pos, self.char_count_with_spaces)
-        
-        self.status_words.setText(f"{stats['words']:,} words")
+        self.status_words.setText(f"{words:,} words")
         
+        chars = chars_with_spaces if self.char_count_with_spaces else chars_without_spaces
         char_mode = "with spaces" if self.char_count_with_spaces else "without spaces"
-        self.status_chars.setText(f"{stats['characters']:,} chars ({char_mode})")
+        self.status_chars.setText(f"{chars:,} chars ({char_mode})")
         
-        self.status_position.setText(f"Ln {stats['current_line']}, Col {stats['current_col']}")
+        self.update_cursor_position()
         
         file_path = editor.get_file_path()
         if file_path:
@@ -603,6 +844,15 @@ class MainWindow(QMainWindow):
         else:
             self.status_file_path.setText("Unsaved")
     
+    def update_cursor_position(self):
+        """Update only the line/column indicator."""
+        editor = self.get_current_editor()
+        if not editor:
+            return
+        
+        line, col = editor.get_line_col()
+        self.status_position.setText(f"Ln {line}, Col {col}")
+    
     def toggle_char_count_mode(self):
         """Toggle character count between with/without spaces."""
         self.char_count_with_spaces = not self.char_count_with_spaces
@@ -626,9 +876,6 @@ class MainWindow(QMainWindow):
     
     def create_find_widget(self):
         """Create inline find widget."""
-        from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel, QPushButton
-        from PyQt6.QtGui import QShortcut, QKeySequence
-        
         self.find_widget = QWidget(self)
         layout = QHBoxLayout()
         layout.setContentsMargins(10, 5, 10, 5)
@@ -662,7 +909,7 @@ class MainWindow(QMainWindow):
         # Case sensitive checkbox
         self.find_case_sensitive = QCheckBox("Match Case")
         layout.addWidget(self.find_case_sensitive)
-        self.find_case_sensitive.stateChanged.connect(self.perform_find)
+        self.find_case_sensitive.stateChanged.connect(self.schedule_find)
         
         # Close button
         close_btn = QPushButton("✕")
@@ -676,8 +923,18 @@ class MainWindow(QMainWindow):
         self.statusBar().insertWidget(0, self.find_widget)
         self.find_widget.hide()
     
+    def schedule_find(self):
+        """Re-run perform_find once Match Case toggling settles."""
+        # Short queries match almost everywhere; those wait for Enter or Search
+        if len(self.find_input.text().strip()) < MIN_LIVE_FIND_LENGTH:
+            self._find_debounce.stop()
+            return
+        self._find_debounce.start()
+    
     def perform_find(self):
         """Perform find and highlight all matches."""
+        # An explicit search supersedes any pending live search
+        self._find_debounce.stop()
         editor = self.get_current_editor()
         if not editor:
             return
@@ -687,75 +944,90 @@ class MainWindow(QMainWindow):
             self.statusBar().showMessage("Please enter text to search", 2000)
             return
         
-        # Get document
-        document = editor.document()
+        case_sensitive = self.find_case_sensitive.isChecked()
         
-        # Set up search flags
-        from PyQt6.QtGui import QTextDocument, QTextCharFormat
-        flags = QTextDocument.FindFlag(0)
-        if self.find_case_sensitive.isChecked():
-            flags |= QTextDocument.FindFlag.FindCaseSensitively
-        
-        # Clear previous selections
-        extra_selections = []
+        # Same query on an unchanged document: step to the next match instead of rescanning
+        cache_key = (editor, search_text, case_sensitive, editor.content_revision())
+        if cache_key == self._find_cache_key:
+            if self.find_matches:
+                self.find_next()
+            return
+        self._find_cache_key = cache_key
         
-        # Store all matches
-        self.find_matches = []
+        self.find_matches = self._collect_matches(editor.get_content(), search_text, case_sensitive)
         self.current_match_index = -1
+        self._apply_highlights(editor, self.find_matches)
         
-        # Search from beginning
-        cursor = QTextCursor(document)
-        cursor.setPosition(0)
-        
-        # Create highlight format
-        highlight_format = QTextCharFormat()
-        highlight_format.setBackground(QColor(255, 255, 0, 120))  # Yellow highlight
+        # Move to first match
+        if self.find_matches:
+            self.current_match_index = 0
+            self.jump_to_match(0)
+            self.statusBar().showMessage(f"Found {len(self.find_matches)} matches", 3000)
+        else:
+            self.statusBar().showMessage("No matches found", 2000)
+    
+    def _collect_matches(self, text: str, search_text: str, case_sensitive: bool,
+                         whole_words: bool = False) -> list:
+        """Return (start, end) document positions of every match of search_text in text."""
+        # One sweep over the plain text instead of a QTextDocument.find() round-trip per match
+        matches = find_literal(text, search_text, case_sensitive, whole_words)
+        if not text.isascii():
+            # Qt positions count UTF-16 units; shift past any astral characters
+            astral = [m.start() for m in _ASTRAL_RE.finditer(text)]
+            if astral:
+                matches = [(start + bisect_left(astral, start), end + bisect_left(astral, end))
+                           for start, end in matches]
+        return matches
+    
+    def _apply_highlights(self, editor, matches: list):
+        """Highlight matches in the editor, skipping the call if nothing changed."""
+        # Keyed on the text revision and the whole list: an edit can move interior
+        # matches while the count and both ends stay put, and replacing the text
+        # collapses the old highlights even where the matches come out the same
+        key = (editor, editor.content_revision(), matches)
+        if key == self._applied_highlights:
+            return
+        self._applied_highlights = key
         
-        while True:
-            cursor = document.find(search_text, cursor, flags)
-            if cursor.isNull():
-                break
-            
-            # Store match position
-            self.find_matches.append(cursor.selectionStart())
+        # Highlights are only built for the first MAX_FIND_HIGHLIGHTS matches
+        document = editor.document()
+        extra_selections = []
+        for start, end in matches[:MAX_FIND_HIGHLIGHTS]:
+            cursor = QTextCursor(document)
+            cursor.setPosition(start)
+            cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
             
-            # Add to selections for highlighting
-            from PyQt6.QtWidgets import QTextEdit
             selection = QTextEdit.ExtraSelection()
             selection.cursor = cursor
-            selection.format = highlight_format
+            selection.format = self.FIND_HIGHLIGHT_FORMAT
             extra_selections.append(selection)
         
         # Apply all highlights at once
         editor.setExtraSelections(extra_selections)
-        
-        # Move to first match
-        if self.find_matches:
-            self.current_match_index = 0
-            self.jump_to_match(0)
-            self.statusBar().showMessage(f"Found {len(self.find_matches)} matches", 3000)
-        else:
-            self.statusBar().showMessage("No matches found", 2000)
     
     def find_next(self):
-        """Jump to next match."""
-        if not hasattr(self, 'find_matches') or not self.find_matches:
+        """Jump to next match after the cursor."""
+        editor = self.get_current_editor()
+        if not editor or not self.find_matches:
             self.perform_find()
             return
         
-        if self.find_matches:
-            self.current_match_index = (self.current_match_index + 1) % len(self.find_matches)
-            self.jump_to_match(self.current_match_index)
+        # First match starting after the cursor; (pos, inf) sorts after every match at pos
+        index = bisect_right(self.find_matches, (editor.textCursor().selectionStart(), float('inf')))
+        self.current_match_index = index % len(self.find_matches)
+        self.jump_to_match(self.current_match_index)
     
     def find_previous(self):
-        """Jump to previous match."""
-        if not hasattr(self, 'find_matches') or not self.find_matches:
+        """Jump to previous match before the cursor."""
+        editor = self.get_current_editor()
+        if not editor or not self.find_matches:
             self.perform_find()
             return
         
-        if self.find_matches:
-            self.current_match_index = (self.current_match_index - 1) % len(self.find_matches)
-            self.jump_to_match(self.current_match_index)
+        # Last match starting before the cursor; (pos,) sorts before every match at pos
+        index = bisect_left(self.find_matches, (editor.textCursor().selectionStart(),)) - 1
+        self.current_match_index = index % len(self.find_matches)
+        self.jump_to_match(self.current_match_index)
     
     def jump_to_match(self, index):
         """Jump to specific match."""
@@ -763,16 +1035,7 @@ class MainWindow(QMainWindow):
         if not editor or not self.find_matches:
             return
         
-        position = self.find_matches[index]
-        search_text = self.find_input.text()
-        
-        # Create cursor and select the match
-        cursor = QTextCursor(editor.document())
-        cursor.setPosition(position)
-        cursor.setPosition(position + len(search_text), QTextCursor.MoveMode.KeepAnchor)
-        
-        editor.setTextCursor(cursor)
-        editor.ensureCursorVisible()
+        self.select_match(editor, *self.find_matches[index])
         
         self.statusBar().showMessage(f"Match {index + 1} of {len(self.find_matches)}", 2000)
     
@@ -789,6 +1052,8 @@ class MainWindow(QMainWindow):
         self.find_widget.hide()
         self.find_matches = []
         self.current_match_index = -1
+        self._find_cache_key = None
+        self._applied_highlights = None
     
     def show_replace_dialog(self):
         """Show find & replace dialog."""
@@ -796,6 +1061,8 @@ class MainWindow(QMainWindow):
         if not editor:
             return
         
+        # Imported on first use; most sessions never open Replace
+        from ui.find_replace_dialog import FindReplaceDialog
         dialog = FindReplaceDialog(self)
         
         # Connect buttons
@@ -806,30 +1073,123 @@ class MainWindow(QMainWindow):
         
         dialog.exec()
     
+    def _find_key(self, dialog, editor) -> tuple:
+        """(editor, query, flags, revision) the cached dialog matches must agree with."""
+        flags = (dialog.case_sensitive.isChecked(), dialog.whole_words.isChecked())
+        return (editor, dialog.find_input.text(), flags, editor.content_revision())
+    
+    def _matches_current(self, dialog, editor) -> bool:
+        """Whether the cached dialog matches belong to the current query and text."""
+        state = self._find_state
+        return (state['editor'], state['query'], state['flags'], state['rev']) == self._find_key(dialog, editor)
+    
+    def _ensure_matches(self, dialog, editor) -> list:
+        """Get the dialog query's matches, rescanning only when the query or text changed."""
+        if not self._matches_current(dialog, editor):
+            _, search_text, flags, revision = self._find_key(dialog, editor)
+            self._find_state.update(editor=editor, query=search_text, flags=flags, rev=revision,
+                                    positions=self._collect_matches(editor.get_content(), search_text, *flags))
+        return self._find_state['positions']
+    
+    def _search_in_background(self, dialog, editor, continuation) -> bool:
+        """
+        Start a background scan when the cache is stale and the document is large.
+        Returns True if one was started; continuation runs once the matches arrive.
+        """
+        if self._matches_current(dialog, editor) or editor.document().characterCount() <= ASYNC_FIND_SIZE:
+            return False
+        
+        if self._find_thread is None:
+            self._find_worker = FindWorker(self._collect_matches)
+            self._find_thread = QThread(self)
+            self._find_worker.moveToThread(self._find_thread)
+            self.find_requested.connect(self._find_worker.run)
+            self._find_worker.matches_ready.connect(self.on_matches_ready)
+            self._find_thread.start()
+        
+        key = self._find_key(dialog, editor)
+        # The same scan is already under way: let it finish, just resume the newer caller
+        if self._find_continuation and self._find_continuation[1] == key:
+            self._find_continuation = (self._find_continuation[0], key, continuation)
+            return True
+        
+        # A newer request supersedes any still queued or running
+        self._find_worker.generation += 1
+        generation = self._find_worker.generation
+        _, search_text, flags, _ = key
+        self._find_continuation = (generation, key, continuation)
+        self.statusBar().showMessage("Searching…")
+        self.find_requested.emit(generation, editor.get_content(), search_text, *flags)
+        return True
+    
+    def on_matches_ready(self, generation: int, positions: list):
+        """Store background matches and resume the search that asked for them."""
+        if not self._find_continuation or self._find_continuation[0] != generation:
+            return
+        _, (editor, search_text, flags, revision), continuation = self._find_continuation
+        self._find_continuation = None
+        self.statusBar().clearMessage()
+        
+        # Matches for an older revision are useless; the continuation will rescan
+        if editor.content_revision() == revision:
+            self._find_state.update(editor=editor, query=search_text, flags=flags, rev=revision,
+                                    positions=positions)
+        continuation()
+    
+    def _patch_matches(self, editor, start: int, old_end: int, new_end: int):
+        """
+        Update the cached matches after replacing [start, old_end) so it ends at new_end.
+        Later matches shift by the length change; only the edited line is rescanned,
+        since a single-line query can't match across lines.
+        """
+        state = self._find_state
+        document = editor.document()
+        delta = new_end - old_end
+        block = document.findBlock(start)
+        block_start = block.position()
+        block_end = block_start + block.length() - 1
+        
+        positions = state['positions']
+        before = positions[:bisect_left(positions, (block_start,))]
+        after = [(s + delta, e + delta)
+                 for s, e in positions[bisect_left(positions, (block_end - delta + 1,)):]]
+        inside = [(block_start + s, block_start + e) for s, e
+                  in self._collect_matches(block.text(), state['query'], *state['flags'])]
+        
+        state['positions'] = before + inside + after
+        state['rev'] = editor.content_revision()
+    
+    def _steps_in_document(self, dialog, editor) -> bool:
+        """
+        Whether Find Next/Previous should step with QTextDocument.find instead of
+        the cached matches: always for a query whose matches can overlap (they are
+        missing from the cached list), and for a large document until its
+        background scan arrives. A small document is scanned on the spot instead.
+        """
+        if _can_overlap(dialog.find_input.text()):
+            return True
+        return (not self._matches_current(dialog, editor)
+                and editor.document().characterCount() > ASYNC_FIND_SIZE)
+    
     def dialog_find_next(self, dialog, editor):
         """Find next in dialog."""
         search_text = dialog.find_input.text()
         if not search_text:
             return
         
-        from PyQt6.QtGui import QTextDocument
-        flags = QTextDocument.FindFlag(0)
-        if dialog.case_sensitive.isChecked():
-            flags |= QTextDocument.FindFlag.FindCaseSensitively
-        if dialog.whole_words.isChecked():
-            flags |= QTextDocument.FindFlag.FindWholeWords
-        
-        cursor = editor.textCursor()
-        found_cursor = editor.document().find(search_text, cursor, flags)
+        if self._steps_in_document(dialog, editor):
+            self._find_in_document(dialog, editor, backward=False)
+            return
         
-        if found_cursor.isNull() and dialog.wrap_around.isChecked():
+        matches = self._ensure_matches(dialog, editor)
+        # First match at or after the end of the current selection
+        index = bisect_left(matches, (editor.textCursor().selectionEnd(),))
+        if index == len(matches) and dialog.wrap_around.isChecked():
             # Wrap around to beginning
-            cursor.setPosition(0)
-            found_cursor = editor.document().find(search_text, cursor, flags)
+            index = 0
         
-        if not found_cursor.isNull():
-            editor.setTextCursor(found_cursor)
-            editor.ensureCursorVisible()
+        if index < len(matches):
+            self.select_match(editor, *matches[index])
         else:
             self.statusBar().showMessage("No more matches found", 2000)
     
@@ -839,72 +1199,148 @@ class MainWindow(QMainWindow):
         if not search_text:
             return
         
-        from PyQt6.QtGui import QTextDocument
-        flags = QTextDocument.FindFlag.FindBackward
-        if dialog.case_sensitive.isChecked():
-            flags |= QTextDocument.FindFlag.FindCaseSensitively
-        if dialog.whole_words.isChecked():
-            flags |= QTextDocument.FindFlag.FindWholeWords
-        
-        cursor = editor.textCursor()
-        found_cursor = editor.document().find(search_text, cursor, flags)
+        if self._steps_in_document(dialog, editor):
+            self._find_in_document(dialog, editor, backward=True)
+            return
         
-        if found_cursor.isNull() and dialog.wrap_around.isChecked():
+        matches = self._ensure_matches(dialog, editor)
+        # Last match starting before the current selection
+        index = bisect_left(matches, (editor.textCursor().selectionStart(),)) - 1
+        if index < 0 and dialog.wrap_around.isChecked():
             # Wrap around to end
-            cursor.movePosition(QTextCursor.MoveOperation.End)
-            found_cursor = editor.document().find(search_text, cursor, flags)
+            index = len(matches) - 1
         
-        if not found_cursor.isNull():
-            editor.setTextCursor(found_cursor)
-            editor.ensureCursorVisible()
+        if index >= 0:
+            self.select_match(editor, *matches[index])
         else:
             self.statusBar().showMessage("No more matches found", 2000)
     
+    def _find_in_document(self, dialog, editor, backward: bool):
+        """
+        Step to the next match with QTextDocument.find, which searches the document
+        in Qt without copying its text; see _steps_in_document for when.
+        Large documents are meanwhile scanned in full on the worker thread, so the
+        steps after this one can use the cached matches.
+        """
+        _, search_text, (case_sensitive, whole_words), _ = self._find_key(dialog, editor)
+        document = editor.document()
+        options = QTextDocument.FindFlag(0)
+        if case_sensitive:
+            options |= QTextDocument.FindFlag.FindCaseSensitively
+        if whole_words:
+            options |= QTextDocument.FindFlag.FindWholeWords
+        if backward:
+            options |= QTextDocument.FindFlag.FindBackward
+        
+        # A plain string search: a regex one steps backward over overlapping matches differently
+        found = document.find(search_text, editor.textCursor(), options)
+        if found.isNull() and dialog.wrap_around.isChecked():
+            # Wrap around to the other end
+            cursor = QTextCursor(document)
+            cursor.movePosition(QTextCursor.MoveOperation.End if backward else QTextCursor.MoveOperation.Start)
+            found = document.find(search_text, cursor, options)
+        
+        if found.isNull():
+            self.statusBar().showMessage("No more matches found", 2000)
+        else:
+            editor.setTextCursor(found)
+            editor.ensureCursorVisible()
+        
+        self._search_in_background(dialog, editor, lambda: None)
+    
+    def select_match(self, editor, start: int, end: int):
+        """Select a match in the editor and scroll it into view."""
+        cursor = QTextCursor(editor.document())
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+        editor.setTextCursor(cursor)
+        editor.ensureCursorVisible()
+    
     def dialog_replace(self, dialog, editor):
         """Replace current selection."""
         search_text = dialog.find_input.text()
         replace_text = dialog.replace_input.text()
         
-        if not search_text:
+        if not search_text or self._still_loading(editor):
             return
         
+        # Only replace when the selection is exactly a match; an empty selection or
+        # one of the wrong length (in UTF-16 units) is ruled out without a search
         cursor = editor.textCursor()
-        if cursor.hasSelection() and cursor.selectedText() == search_text:
+        selection = (cursor.selectionStart(), cursor.selectionEnd())
+        query_length = len(search_text) + len(_ASTRAL_RE.findall(search_text))
+        if selection[1] - selection[0] == query_length and self._is_match(dialog, editor, *selection):
+            cached = self._matches_current(dialog, editor)
             cursor.insertText(replace_text)
+            if cached:
+                self._patch_matches(editor, selection[0], selection[1], cursor.position())
             self.statusBar().showMessage("Replaced 1 occurrence", 2000)
         
         # Find next
         self.dialog_find_next(dialog, editor)
     
+    def _is_match(self, dialog, editor, start: int, end: int) -> bool:
+        """
+        Whether [start, end) is a match of the dialog query. Uses the cached matches
+        when current, otherwise asks QTextDocument.find from start rather than rescanning.
+        A query whose matches can overlap is always asked of QTextDocument.find: its
+        steps can land on matches the non-overlapping cached list leaves out.
+        """
+        if not _can_overlap(dialog.find_input.text()) and self._matches_current(dialog, editor):
+            matches = self._find_state['positions']
+            index = bisect_left(matches, (start, end))
+            return index < len(matches) and matches[index] == (start, end)
+        
+        _, search_text, (case_sensitive, whole_words), _ = self._find_key(dialog, editor)
+        options = QTextDocument.FindFlag.FindCaseSensitively if case_sensitive else QTextDocument.FindFlag(0)
+        found = editor.document().find(_qt_literal(search_text, whole_words), start, options)
+        return not found.isNull() and (found.selectionStart(), found.selectionEnd()) == (start, end)
+    
     def dialog_replace_all(self, dialog, editor):
         """Replace all occurrences."""
         search_text = dialog.find_input.text()
         replace_text = dialog.replace_input.text()
         
-        if not search_text:
+        if not search_text or self._still_loading(editor):
             return
         
-        from PyQt6.QtGui import QTextDocument
-        flags = QTextDocument.FindFlag(0)
-        if dialog.case_sensitive.isChecked():
-            flags |= QTextDocument.FindFlag.FindCaseSensitively
-        if dialog.whole_words.isChecked():
-            flags |= QTextDocument.FindFlag.FindWholeWords
-        
-        cursor = QTextCursor(editor.document())
-        cursor.beginEditBlock()
+        # Nothing cached to replace: skip the text pass entirely
+        matches = self._ensure_matches(dialog, editor)
+        if not matches:
+            self.statusBar().showMessage("Replaced 0 occurrences", 3000)
+            return
         
-        count = 0
-        cursor.setPosition(0)
+        if len(matches) <= REPLACE_IN_PLACE_LIMIT:
+            # Edit the matches right to left, so positions still to be visited never shift
+            # and the rest of the document (and its highlighting) is left alone
+            cursor = QTextCursor(editor.document())
+            cursor.beginEditBlock()
+            for start, end in reversed(matches):
+                cursor.setPosition(start)
+                cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+                cursor.insertText(replace_text)
+            cursor.endEditBlock()
+            
+            self.statusBar().showMessage(f"Replaced {len(matches)} occurrences", 3000)
+            return
         
-        while True:
-            cursor = editor.document().find(search_text, cursor, flags)
-            if cursor.isNull():
-                break
-            cursor.insertText(replace_text)
-            count += 1
+        # Replace in the plain text, then write the result back as a single edit
+        new_text, count = _count_replace(editor.get_content(), search_text, replace_text,
+                                         dialog.case_sensitive.isChecked(),
+                                         dialog.whole_words.isChecked())
+        if count:
+            position = editor.textCursor().position()
+            
+            cursor = QTextCursor(editor.document())
+            cursor.beginEditBlock()
+            cursor.select(QTextCursor.SelectionType.Document)
+            cursor.insertText(new_text)
+            cursor.endEditBlock()
+            
+            # Put the caret back where it was, as far as the new text allows
+            cursor.setPosition(min(position, editor.document().characterCount() - 1))
+            editor.setTextCursor(cursor)
         
-        cursor.endEditBlock()
         self.statusBar().showMessage(f"Replaced {count} occurrences", 3000)
     
     def toggle_spell_check(self, checked: bool):
@@ -912,21 +1348,60 @@ class MainWindow(QMainWindow):
         self.spell_checker.set_enabled(checked)
         self.file_ops.set_setting('spell_check_enabled', checked)
         
-        # Update all editors
-        for i in range(self.tab_widget.count()):
-            editor = self.tab_widget.widget(i)
-            if checked:
-                editor.check_spelling()
-            else:
-                # Clear spell check highlights
-                pass
+        # Update all editors (rehighlighting while disabled clears underlines)
+        self.refresh_spelling()
+    
+    def on_spell_checker_ready(self):
+        """Apply the saved toggle and highlight all open tabs once the dictionary has loaded."""
+        # Enabled only here, on the GUI thread, so it can't race toggle_spell_check
+        self.spell_checker.set_enabled(self.file_ops.get_setting('spell_check_enabled', True))
+        self.refresh_spelling()
+    
+    def refresh_spelling(self):
+        """
+        Re-run spell highlighting in every tab without blocking: what is on
+        screen is done now, the rest in idle steps, current tab first.
+        """
+        current = self.get_current_editor()
+        editors = [current] if current else []
+        editors += [editor for editor in self.iter_editors() if editor is not current]
+        self._spellcheck_queue = [editor for editor in editors if editor.begin_spell_refresh()]
+        if self._spellcheck_queue:
+            self._spellcheck_timer.start()
+    
+    def _spellcheck_next_chunk(self):
+        """Advance the front editor's spell sweep by one step, then yield to the event loop."""
+        if self._spellcheck_queue and self._spellcheck_queue[0].spell_sweep_step():
+            self._spellcheck_queue.pop(0)
+        if self._spellcheck_queue:
+            self._spellcheck_timer.start()
     
     def show_font_dialog(self):
-        """Show font settings dialog."""
+        """Show font settings dialog (built on first use, then reused)."""
         editor = self.get_current_editor()
         if not editor:
             return
         
+        if self._font_dialog is None:
+            self._font_dialog = self._build_font_dialog()
+        dialog = self._font_dialog
+        
+        # Load the current editor's settings without firing the live preview
+        for widget in (dialog.font_combo, dialog.size_spin):
+            widget.blockSignals(True)
+        dialog.font_combo.setCurrentText(editor.current_font_family)
+        dialog.size_spin.setValue(editor.current_font_size)
+        for widget in (dialog.font_combo, dialog.size_spin):
+            widget.blockSignals(False)
+        dialog.bold_check.setChecked(editor.current_font_bold)
+        dialog.italic_check.setChecked(editor.current_font_italic)
+        dialog.underline_check.setChecked(editor.current_font_underline)
+        self._set_preview_color(editor.current_text_color.name())
+        
+        dialog.exec()
+    
+    def _build_font_dialog(self) -> QDialog:
+        """Create the font settings dialog; its slots act on whichever editor is current."""
         dialog = QDialog(self)
         dialog.setWindowTitle("✨ Font & Style Settings")
         dialog.setMinimumWidth(450)
@@ -958,9 +1433,8 @@ class MainWindow(QMainWindow):
             "Georgia",
             "Verdana"
         ])
-        font_combo.setCurrentText(editor.current_font_family)
         font_combo.setStyleSheet("padding: 8px; font-size: 12px;")
-        font_combo.currentTextChanged.connect(lambda: self.preview_font(editor, font_combo, size_spin))
+        font_combo.currentTextChanged.connect(self.preview_font)
         family_group.addWidget(font_combo)
         layout.addLayout(family_group)
         
@@ -973,10 +1447,9 @@ class MainWindow(QMainWindow):
         size_layout = QHBoxLayout()
         size_spin = QSpinBox()
         size_spin.setRange(8, 72)
-        size_spin.setValue(editor.current_font_size)
         size_spin.setSuffix(" pt")
         size_spin.setStyleSheet("padding: 8px; font-size: 12px;")
-        size_spin.valueChanged.connect(lambda: self.preview_font(editor, font_combo, size_spin))
+        size_spin.valueChanged.connect(self.preview_font)
         size_layout.addWidget(size_spin)
         
         # Quick size buttons
@@ -998,17 +1471,14 @@ class MainWindow(QMainWindow):
         style_layout = QHBoxLayout()
         
         bold_check = QCheckBox("Bold")
-        bold_check.setChecked(editor.current_font_bold)
         bold_check.setStyleSheet("font-weight: bold;")
         style_layout.addWidget(bold_check)
         
         italic_check = QCheckBox("Italic")
-        italic_check.setChecked(editor.current_font_italic)
         italic_check.setStyleSheet("font-style: italic;")
         style_layout.addWidget(italic_check)
         
         underline_check = QCheckBox("Underline")
-        underline_check.setChecked(editor.current_font_underline)
         underline_check.setStyleSheet("text-decoration: underline;")
         style_layout.addWidget(underline_check)
         
@@ -1025,20 +1495,19 @@ class MainWindow(QMainWindow):
         
         self.color_preview = QPushButton()
         self.color_preview.setFixedSize(60, 30)
-        self.color_preview.setStyleSheet(f"background-color: {editor.current_text_color.name()}; border: 2px solid #666; border-radius: 4px;")
+        self._preview_color = None
         color_layout.addWidget(self.color_preview)
         
         color_btn = QPushButton("Choose Color...")
-        color_btn.clicked.connect(lambda: self.dialog_choose_color(editor))
+        color_btn.clicked.connect(self.dialog_choose_color)
         color_layout.addWidget(color_btn)
         
         # Quick color presets
-        preset_colors = ["#e0e0e0", "#ffffff", "#ff6b6b", "#4ecdc4", "#45b7d1", "#feca57", "#ee5a6f", "#c7ecee"]
-        for color in preset_colors:
+        for color in _PRESET_COLORS:
             preset_btn = QPushButton()
             preset_btn.setFixedSize(25, 25)
-            preset_btn.setStyleSheet(f"background-color: {color}; border: 1px solid #666; border-radius: 3px;")
-            preset_btn.clicked.connect(lambda checked, c=color: self.apply_preset_color(editor, c))
+            preset_btn.setStyleSheet(_PRESET_STYLESHEETS[color])
+            preset_btn.clicked.connect(lambda checked, c=color: self.apply_preset_color(c))
             color_layout.addWidget(preset_btn)
         
         color_group.addLayout(color_layout)
@@ -1054,7 +1523,7 @@ class MainWindow(QMainWindow):
         button_layout.addStretch()
         
         reset_btn = QPushButton("🔄 Reset to Default")
-        reset_btn.clicked.connect(lambda: self.reset_font_settings(editor, font_combo, size_spin, bold_check, italic_check, underline_check))
+        reset_btn.clicked.connect(self.reset_font_settings)
         button_layout.addWidget(reset_btn)
         
         cancel_btn = QPushButton("Cancel")
@@ -1064,56 +1533,81 @@ class MainWindow(QMainWindow):
         apply_btn = QPushButton("✅ Apply")
         apply_btn.setDefault(True)
         apply_btn.setStyleSheet("background-color: #4CAF50; color: white; font-weight: bold; padding: 8px 16px;")
-        apply_btn.clicked.connect(lambda: self.apply_font_settings(
-            editor, font_combo, size_spin, bold_check, italic_check, underline_check, dialog
-        ))
+        apply_btn.clicked.connect(self.apply_font_settings)
         button_layout.addWidget(apply_btn)
         
         layout.addLayout(button_layout)
         
         dialog.setLayout(layout)
-        dialog.exec()
+        
+        # Kept on the dialog so the slots and later opens can reach them
+        dialog.font_combo = font_combo
+        dialog.size_spin = size_spin
+        dialog.bold_check = bold_check
+        dialog.italic_check = italic_check
+        dialog.underline_check = underline_check
+        return dialog
     
-    def preview_font(self, editor, font_combo, size_spin):
+    def preview_font(self):
         """Live preview of font changes."""
-        editor.set_font_family(font_combo.currentText())
-        editor.set_font_size(size_spin.value())
+        editor = self.get_current_editor()
+        if editor:
+            editor.set_font_family(self._font_dialog.font_combo.currentText())
+            editor.set_font_size(self._font_dialog.size_spin.value())
     
-    def dialog_choose_color(self, editor):
+    def _set_preview_color(self, color_hex: str):
+        """Show color_hex in the color swatch, restyling it only when it changes."""
+        if color_hex != self._preview_color:
+            self._preview_color = color_hex
+            self.color_preview.setStyleSheet(_preview_style(color_hex))
+    
+    def dialog_choose_color(self):
         """Choose custom text color."""
+        editor = self.get_current_editor()
+        if not editor:
+            return
         color = QColorDialog.getColor(editor.current_text_color, self, "Choose Text Color")
         if color.isValid():
             editor.set_text_color(color)
-            self.color_preview.setStyleSheet(f"background-color: {color.name()}; border: 2px solid #666; border-radius: 4px;")
+            self._set_preview_color(color.name())
     
-    def apply_preset_color(self, editor, color_hex):
+    def apply_preset_color(self, color_hex):
         """Apply preset color."""
+        editor = self.get_current_editor()
+        if not editor:
+            return
         color = QColor(color_hex)
         editor.set_text_color(color)
-        self.color_preview.setStyleSheet(f"background-color: {color_hex}; border: 2px solid #666; border-radius: 4px;")
+        self._set_preview_color(color_hex)
     
-    def reset_font_settings(self, editor, font_combo, size_spin, bold_check, italic_check, underline_check):
+    def reset_font_settings(self):
         """Reset to default font settings."""
-        font_combo.setCurrentText("Consolas")
-        size_spin.setValue(11)
-        bold_check.setChecked(False)
-        italic_check.setChecked(False)
-        underline_check.setChecked(False)
-        editor.set_font_family("Consolas")
-        editor.set_font_size(11)
-        editor.set_font_bold(False)
-        editor.set_font_italic(False)
-        editor.set_font_underline(False)
-        editor.set_text_color(QColor("#e0e0e0"))
-        self.color_preview.setStyleSheet(f"background-color: #e0e0e0; border: 2px solid #666; border-radius: 4px;")
-    
-    def apply_font_settings(self, editor, font_combo, size_spin, bold_check, italic_check, underline_check, dialog):
+        dialog = self._font_dialog
+        dialog.font_combo.setCurrentText("Consolas")
+        dialog.size_spin.setValue(11)
+        dialog.bold_check.setChecked(False)
+        dialog.italic_check.setChecked(False)
+        dialog.underline_check.setChecked(False)
+        editor = self.get_current_editor()
+        if editor:
+            editor.set_font_family("Consolas")
+            editor.set_font_size(11)
+            editor.set_font_bold(False)
+            editor.set_font_italic(False)
+            editor.set_font_underline(False)
+            editor.set_text_color(QColor("#e0e0e0"))
+        self._set_preview_color("#e0e0e0")
+    
+    def apply_font_settings(self):
         """Apply all font settings."""
-        editor.set_font_family(font_combo.currentText())
-        editor.set_font_size(size_spin.value())
-        editor.set_font_bold(bold_check.isChecked())
-        editor.set_font_italic(italic_check.isChecked())
-        editor.set_font_underline(underline_check.isChecked())
+        dialog = self._font_dialog
+        editor = self.get_current_editor()
+        if editor:
+            editor.set_font_family(dialog.font_combo.currentText())
+            editor.set_font_size(dialog.size_spin.value())
+            editor.set_font_bold(dialog.bold_check.isChecked())
+            editor.set_font_italic(dialog.italic_check.isChecked())
+            editor.set_font_underline(dialog.underline_check.isChecked())
         dialog.accept()
     
     def toggle_bold(self, checked):
@@ -1151,11 +1645,35 @@ class MainWindow(QMainWindow):
         if color.isValid():
             editor.set_text_color(color)
     
+    def _build_theme_menu(self):
+        """Add an action per theme to the theme menu on its first showing."""
+        if not self.theme_menu.isEmpty():
+            return
+        for theme_id, theme_name, theme_desc in self.theme_manager.theme_list:
+            theme_action = QAction(theme_name, self)
+            if theme_desc:
+                theme_action.setToolTip(theme_desc)
+            # The id rides on the action, so every action shares one slot
+            theme_action.setData(theme_id)
+            theme_action.triggered.connect(self._on_theme_action)
+            self.theme_menu.addAction(theme_action)
+    
+    def _on_theme_action(self):
+        """Apply the theme stored on the triggering menu action."""
+        self.apply_theme(self.sender().data())
+    
     def apply_theme(self, theme_id: str):
         """Apply theme to application."""
+        # Re-applying a stylesheet repolishes every widget, so a no-op apply returns early
+        if theme_id == self._current_theme_id:
+            return
+        
         if self.theme_manager.set_current_theme(theme_id):
+            self._current_theme_id = theme_id
             stylesheet = self.theme_manager.generate_stylesheet()
-            self.setStyleSheet(stylesheet)
+            if stylesheet != self._current_stylesheet:
+                self._current_stylesheet = stylesheet
+                self.setStyleSheet(stylesheet)
             self.file_ops.set_setting('theme', theme_id)
             
             # Show friendly notification
@@ -1171,8 +1689,10 @@ class MainWindow(QMainWindow):
         """Toggle line numbers for all tabs."""
         self.file_ops.set_setting('show_line_numbers', checked)
         
-        for i in range(self.tab_widget.count()):
-            editor = self.tab_widget.widget(i)
+        # Only the visible tab relayouts now; the others pick the setting
+        # up in on_tab_changed when they are next shown
+        editor = self.get_current_editor()
+        if editor:
             editor.set_show_line_numbers(checked)
     
     def toggle_fullscreen(self):
@@ -1216,24 +1736,63 @@ class MainWindow(QMainWindow):
         QMessageBox.information(self, "Keyboard Shortcuts", shortcuts_text)
     
     def auto_save_all(self):
-        """Auto-save all modified tabs."""
-        for i in range(self.tab_widget.count()):
-            editor = self.tab_widget.widget(i)
-            if editor.is_modified and editor.get_file_path():
-                content = editor.get_content()
-                self.file_ops.write_file(editor.get_file_path(), content)
-                editor.mark_saved()
+        """
+        Auto-save all modified tabs (written together on the autosave thread).
+        A tab is marked saved only once its write has succeeded.
+        """
+        jobs = []
+        for editor in self.iter_editors():
+            # A tab still streaming in is picked up by a later autosave
+            if not editor.is_modified or not editor.get_file_path() or editor.loading:
+                continue
+            # Skip tabs whose document hasn't changed since the last autosave,
+            # or whose current text is already being written
+            revision = editor.content_revision()
+            if revision in (self._last_saved_revision.get(editor), self._autosave_pending.get(editor)):
+                continue
+            self._autosave_pending[editor] = revision
+            jobs.append((editor, revision, editor.get_file_path(), editor.get_content()))
+        
+        if jobs:
+            durable = self.file_ops.get_setting('durable_autosave', False)
+            self._autosave_pool.start(AutoSaveTask(self.file_ops, jobs, durable, self.autosave_done.emit))
+    
+    def _on_autosaved(self, editor, revision: int, file_path: str, saved: bool):
+        """Record a finished autosave write (GUI thread)."""
+        if self._autosave_pending.get(editor) == revision:
+            del self._autosave_pending[editor]
+        if editor not in self._editors:
+            return  # Tab closed meanwhile
+        
+        if not saved:
+            self.statusBar().showMessage(f"Auto-save failed: {file_path}", 5000)
+            return
+        self._last_saved_revision[editor] = revision
+        # Only clean if nothing was typed and no Save As happened since the snapshot
+        if editor.content_revision() == revision and editor.get_file_path() == file_path:
+            editor.mark_saved()
+            self.tab_widget.setTabText(self._editors.index(editor), editor.get_display_name())
     
     def save_session(self):
         """Save current session."""
         tabs = []
-        for i in range(self.tab_widget.count()):
-            editor = self.tab_widget.widget(i)
+        for editor in self.iter_editors():
+            file_path = editor.get_file_path()
+            # Reuse the previous entry while the document and tab name are unchanged,
+            # so an untitled tab's text is only pulled out of the document when edited
+            key = (editor.content_revision(), file_path, editor.custom_tab_name)
+            cached = self._session_entries.get(editor)
+            if cached is not None and cached[0] == key:
+                tabs.append(cached[1])
+                continue
+            
+            # Files are reloaded from disk on restore, so only untitled tabs keep their text
             tab_data = {
-                'file_path': editor.get_file_path(),
-                'content': editor.get_content() if not editor.get_file_path() else None,
+                'file_path': file_path,
+                'content': None if file_path else editor.get_content(),
                 'custom_name': editor.custom_tab_name
             }
+            self._session_entries[editor] = (key, tab_data)
             tabs.append(tab_data)
         
         self.file_ops.save_session(tabs)
@@ -1242,19 +1801,55 @@ class MainWindow(QMainWindow):
         """Restore previous session."""
         tabs = self.file_ops.restore_session()
         
-        for tab_data in tabs:
-            file_path = tab_data.get('file_path')
-            content = tab_data.get('content', '')
-            custom_name = tab_data.get('custom_name')
-            
-            if file_path and os.path.exists(file_path):
-                content = self.file_ops.read_file(file_path)
-                editor = self.new_tab(file_path, content)
-            elif content:
-                editor = self.new_tab(content=content)
-            
-            if custom_name:
-                editor.set_custom_name(custom_name)
+        # Tabs are created empty; each file is read when its tab first becomes current
+        self._restoring = True
+        try:
+            for tab_data in tabs:
+                file_path = tab_data.get('file_path')
+                content = tab_data.get('content', '')
+                custom_name = tab_data.get('custom_name')
+                
+                if file_path and os.path.exists(file_path):
+                    editor = self.new_tab(file_path)
+                    self._deferred_paths[editor] = file_path
+                elif content:
+                    editor = self.new_tab(content=content)
+                
+                if custom_name:
+                    editor.set_custom_name(custom_name)
+        finally:
+            self._restoring = False
+        
+        editor = self.get_current_editor()
+        if editor:
+            self.load_deferred(editor)
+    
+    def load_deferred(self, editor):
+        """Read the file of a restored tab that hasn't been shown yet."""
+        # Left deferred while another file streams in; _after_stream comes back to it
+        if self._streaming:
+            return
+        file_path = self._deferred_paths.pop(editor, None)
+        if file_path is None:
+            return
+        
+        # Large files stream in like open_file_path; the rest load in one go
+        if os.path.exists(file_path) and os.path.getsize(file_path) > LARGE_FILE_SIZE:
+            loaded = self._stream_file(editor, file_path)
+        else:
+            content = self.file_ops.read_file(file_path)
+            loaded = content is not None
+            if loaded:
+                editor.load_content_fast(content)
+        
+        if not loaded:
+            # Unbind the still empty tab, so saving it can't overwrite the file
+            editor.set_file_path(None)
+            self.tab_widget.setTabText(self._editors.index(editor), editor.get_display_name())
+            if editor is self.get_current_editor():
+                self.setWindowTitle(f"{editor.get_display_name()} – Kun")
+            QMessageBox.warning(self, "Open Failed", f"Could not read file: {file_path}")
+        self.update_status_bar()
     
     def dragEnterEvent(self, event: QDragEnterEvent):
         """Handle drag enter."""
@@ -1263,41 +1858,79 @@ class MainWindow(QMainWindow):
     
     def dropEvent(self, event: QDropEvent):
         """Handle drop."""
-        for url in event.mimeData().urls():
-            file_path = url.toLocalFile()
-            if file_path.endswith('.txt'):
-                self.open_file_path(file_path)
+        paths = [url.toLocalFile() for url in event.mimeData().urls()]
+        paths = [p for p in paths if os.path.splitext(p)[1].lower() in _ALLOWED_EXT]
+        event.acceptProposedAction()
+        # Open after the drop returns, one file per event loop pass,
+        # so the first tab shows before the rest are read
+        if paths:
+            QTimer.singleShot(0, lambda: self._open_dropped(paths))
+    
+    def _open_dropped(self, paths: list):
+        """Open the next dropped file and schedule the remainder."""
+        self.open_file_path(paths[0])
+        if len(paths) > 1:
+            QTimer.singleShot(0, lambda: self._open_dropped(paths[1:]))
     
     def closeEvent(self, event):
         """Handle window close."""
-        # Save session
-        self.save_session()
-        
-        # Check for unsaved changes
-        has_unsaved = False
-        for i in range(self.tab_widget.count()):
-            if self.tab_widget.widget(i).is_modified:
-                has_unsaved = True
-                break
+        # The window can't close under a file that is still streaming in
+        if self._streaming:
+            self.statusBar().showMessage("Still loading; close once the file has opened", 3000)
+            event.ignore()
+            return
         
-        if has_unsaved:
-            reply = QMessageBox.question(
-                self, 'Unsaved Changes',
-                'You have unsaved changes. Save before closing?',
-                QMessageBox.StandardButton.Save | 
-                QMessageBox.StandardButton.Discard | 
-                QMessageBox.StandardButton.Cancel
-            )
+        # Session and any saves below are written to the config once
+        with self.file_ops.batch():
+            # Save session
+            self.save_session()
             
-            if reply == QMessageBox.StandardButton.Save:
-                # Save all modified tabs
-                for i in range(self.tab_widget.count()):
-                    self.tab_widget.setCurrentIndex(i)
-                    self.save_file()
-                event.accept()
-            elif reply == QMessageBox.StandardButton.Cancel:
-                event.ignore()
+            # Collect unsaved tabs up front so one dialog covers all of them
+            dirty = [i for i, editor in enumerate(self.iter_editors()) if editor.is_modified]
+            
+            if dirty:
+                names = [self._editors[i].get_display_name() for i in dirty]
+                box = QMessageBox(self)
+                box.setIcon(QMessageBox.Icon.Question)
+                box.setWindowTitle('Unsaved Changes')
+                if len(dirty) == 1:
+                    box.setText(f'Save changes to {names[0]} before closing?')
+                    save_button = QMessageBox.StandardButton.Save
+                else:
+                    box.setText(f'Save {len(dirty)} files before closing?')
+                    shown = names[:10] + ([f'… and {len(names) - 10} more'] if len(names) > 10 else [])
+                    box.setInformativeText('\n'.join(shown))
+                    save_button = QMessageBox.StandardButton.SaveAll
+                box.setStandardButtons(save_button |
+                                       QMessageBox.StandardButton.Discard |
+                                       QMessageBox.StandardButton.Cancel)
+                box.setDefaultButton(save_button)
+                reply = box.exec()
+                
+                if reply == save_button:
+                    # Save only the modified tabs, in place rather than by switching to each
+                    self.tab_widget.blockSignals(True)
+                    self.setUpdatesEnabled(False)
+                    try:
+                        for i in dirty:
+                            self.save_file(i)
+                    finally:
+                        self.setUpdatesEnabled(True)
+                        self.tab_widget.blockSignals(False)
+                    event.accept()
+                elif reply == QMessageBox.StandardButton.Cancel:
+                    event.ignore()
+                else:
+                    event.accept()
             else:
                 event.accept()
-        else:
-            event.accept()
+            
+            # Last write of the run: make sure it reaches the disk
+            self.file_ops.flush(durable=True)
+        
+        # Autosaves already queued still reach the disk
+        if event.isAccepted():
+            self._autosave_pool.waitForDone()
+        if event.isAccepted() and self._find_thread is not None:
+            self._find_thread.quit()
+            self._find_thread.wait()
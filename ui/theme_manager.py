@@ -3,75 +3,20 @@ Theme management module for Kun text editor.
 Loads and applies visual themes from JSON files.
 """
 import json
+import os
 from pathlib import Path
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
+try:
+    import orjson
+except ImportError:
+    # Optional faster JSON backend; stdlib json is used otherwise
+    orjson = None
 
-class ThemeManager:
-    """Manages application themes and styling."""
-    
-    def __init__(self, themes_dir: str = None):
-        if themes_dir is None:
-            themes_dir = Path(__file__).parent.parent / "assets" / "themes"
-        self.themes_dir = Path(themes_dir)
-        self.current_theme = None
-        self.available_themes = self.load_available_themes()
-    
-    def load_available_themes(self) -> Dict[str, dict]:
-        """Load all available theme files."""
-        themes = {}
-        if not self.themes_dir.exists():
-            return themes
-        
-        for theme_file in self.themes_dir.glob("*.json"):
-            try:
-                with open(theme_file, 'r', encoding='utf-8') as f:
-                    theme_data = json.load(f)
-                    theme_id = theme_file.stem
-                    themes[theme_id] = theme_data
-            except Exception as e:
-                print(f"Error loading theme {theme_file}: {e}")
-        
-        return themes
-    
-    def get_theme(self, theme_id: str) -> Optional[dict]:
-        """Get theme data by ID."""
-        return self.available_themes.get(theme_id)
-    
-    def set_current_theme(self, theme_id: str) -> bool:
-        """Set the current active theme."""
-        theme = self.get_theme(theme_id)
-        if theme:
-            self.current_theme = theme
-            return True
-        return False
-    
-    def get_current_theme(self) -> Optional[dict]:
-        """Get the currently active theme."""
-        return self.current_theme
-    
-    def get_theme_names(self) -> list:
-        """Get list of available theme names."""
-        return [theme.get('name', tid) for tid, theme in self.available_themes.items()]
-    
-    def get_theme_ids(self) -> list:
-        """Get list of available theme IDs."""
-        return list(self.available_themes.keys())
-    
-    def generate_stylesheet(self, theme: dict = None) -> str:
-        """Generate Qt stylesheet from theme data."""
-        if theme is None:
-            theme = self.current_theme
-        
-        if not theme:
-            return ""
-        
-        colors = theme.get('colors', {})
-        
-        # Check if theme has glass effects
-        has_glass = theme.get('effects', {}).get('glass', False)
-        
-        stylesheet = f"""
+
+def _stylesheet_template(colors, has_glass: bool) -> str:
+    """The application stylesheet, written against a theme's colors mapping."""
+    return f"""
             QMainWindow {{
                 background-color: {colors.get('window_bg', '#1a1a1a')};
             }}
@@ -229,11 +174,160 @@ class ThemeManager:
                 spacing: 8px;
             }}
         """
+
+
+def _render_stylesheet(theme: dict) -> str:
+    """Fill the stylesheet template from a theme's colors and its glass flag."""
+    return _stylesheet_template(theme.get('colors', {}), bool(theme.get('effects', {}).get('glass', False)))
+
+
+class ThemeManager:
+    """Manages application themes and styling."""
+    
+    __slots__ = ('themes_dir', 'current_theme', 'current_theme_id', '_current_colors',
+                 '_qss_cache', 'available_themes', '_theme_list', '_theme_paths')
+    
+    def __init__(self, themes_dir: str = None):
+        if themes_dir is None:
+            themes_dir = Path(__file__).parent.parent / "assets" / "themes"
+        self.themes_dir = Path(themes_dir)
+        self.current_theme = None
+        self.current_theme_id: Optional[str] = None
+        # The current theme's colors, so get_color is a single lookup
+        self._current_colors: dict = {}
+        # Generated stylesheets by theme ID
+        self._qss_cache: Dict[str, str] = {}
+        # Parsed themes by ID, filled in as each one is first asked for
+        self.available_themes: Dict[str, dict] = {}
+        self._theme_list: Optional[List[Tuple[str, str, str]]] = None
+        self._theme_paths = self.load_available_themes()
+    
+    def load_available_themes(self) -> Dict[str, str]:
+        """
+        Index the theme files by ID without parsing them; get_theme() parses
+        a theme the first time it is needed, so startup reads only the one in use.
+        """
+        self._qss_cache.clear()
+        self.available_themes.clear()
+        self._theme_list = None
+        paths = {}
+        try:
+            with os.scandir(self.themes_dir) as entries:
+                for entry in entries:
+                    # is_file() answers from the directory entry's type, without a stat
+                    if entry.name.endswith('.json') and entry.is_file():
+                        paths[entry.name[:-5]] = entry.path
+        except OSError:
+            pass  # No themes directory
+        return paths
+    
+    def get_theme(self, theme_id: str) -> Optional[dict]:
+        """Get theme data by ID (parsed and kept on first use)."""
+        theme = self.available_themes.get(theme_id)
+        if theme is None and theme_id in self._theme_paths:
+            self._load_themes([theme_id])
+            theme = self.available_themes.get(theme_id)
+        return theme
+    
+    def _load_themes(self, theme_ids: List[str]):
+        """
+        Read and parse the given themes into available_themes. Several files are
+        parsed as one JSON array in a single call; if that fails, file by file,
+        so one broken theme is reported on its own.
+        """
+        blobs = []
+        for theme_id in theme_ids:
+            try:
+                # Parsed straight from bytes, without a text-mode decoding wrapper
+                with open(self._theme_paths[theme_id], 'rb') as f:
+                    blobs.append(f.read())
+            except OSError as e:
+                print(f"Error loading theme {self._theme_paths[theme_id]}: {e}")
+                blobs.append(b'')
+        
+        loads = orjson.loads if orjson is not None else json.loads
+        if len(blobs) > 1:
+            try:
+                themes = loads(b'[' + b','.join(blobs) + b']')
+            except ValueError:
+                themes = None
+            # A blob that isn't exactly one object would shift the rest; count and check them
+            if themes is not None and len(themes) == len(blobs) and all(type(t) is dict for t in themes):
+                self.available_themes.update(zip(theme_ids, themes))
+                return
         
+        for theme_id, data in zip(theme_ids, blobs):
+            try:
+                self.available_themes[theme_id] = loads(data)
+            except ValueError as e:
+                print(f"Error loading theme {self._theme_paths[theme_id]}: {e}")
+                # Forget the broken file so it isn't retried or listed
+                del self._theme_paths[theme_id]
+    
+    def set_current_theme(self, theme_id: str) -> bool:
+        """Set the current active theme."""
+        theme = self.get_theme(theme_id)
+        if theme:
+            self.current_theme = theme
+            self.current_theme_id = theme_id
+            self._current_colors = theme.get('colors', {})
+            return True
+        return False
+    
+    def get_current_theme(self) -> Optional[dict]:
+        """Get the currently active theme."""
+        return self.current_theme
+    
+    def get_theme_names(self) -> list:
+        """Get list of available theme names."""
+        return [theme.get('name', tid) for tid, theme in self.get_all_themes().items()]
+    
+    def get_all_themes(self) -> Dict[str, dict]:
+        """Get every theme keyed by ID, in directory order (parses any not yet loaded)."""
+        unloaded = [tid for tid in self._theme_paths if tid not in self.available_themes]
+        if unloaded:
+            self._load_themes(unloaded)
+        themes = {}
+        for theme_id in list(self._theme_paths):
+            theme = self.get_theme(theme_id)
+            if theme is not None:
+                themes[theme_id] = theme
+        return themes
+    
+    @property
+    def theme_list(self) -> List[Tuple[str, str, str]]:
+        """(id, name, description) for every theme, built once for menus."""
+        if self._theme_list is None:
+            self._theme_list = [(tid, theme.get('name', tid), theme.get('description', ''))
+                                for tid, theme in self.get_all_themes().items()]
+        return self._theme_list
+    
+    def get_theme_ids(self) -> list:
+        """Get list of available theme IDs."""
+        return list(self.get_all_themes())
+    
+    def generate_stylesheet(self, theme: dict = None) -> str:
+        """Generate Qt stylesheet from theme data (the current theme's is cached)."""
+        if theme is None:
+            if self.current_theme_id is None:
+                return ""
+            return self.get_stylesheet(self.current_theme_id)
+        
+        if not theme:
+            return ""
+        return _render_stylesheet(theme)
+    
+    def get_stylesheet(self, theme_id: str) -> str:
+        """Get the stylesheet for a theme by ID, built once and then reused."""
+        stylesheet = self._qss_cache.get(theme_id)
+        if stylesheet is None:
+            theme = self.get_theme(theme_id)
+            if theme is None:
+                return ""
+            stylesheet = _render_stylesheet(theme)
+            self._qss_cache[theme_id] = stylesheet
         return stylesheet
     
     def get_color(self, color_key: str, default: str = '#000000') -> str:
         """Get a specific color from current theme."""
-        if not self.current_theme:
-            return default
-        return self.current_theme.get('colors', {}).get(color_key, default)
+        return self._current_colors.get(color_key, default)